@@ -0,0 +1,333 @@
+"""
+Benchmarks for the game's hot paths, compared against a stored baseline.
+
+    python benchmarks.py              # run all, compare with benchmark_baseline.json
+    python benchmarks.py --save       # record the current timings as the baseline
+    python benchmarks.py -k to_dict   # only benchmarks whose name contains 'to_dict'
+    python benchmarks.py --memory     # bytes per object for large populations
+
+Exits with status 1 if any benchmark is slower than its baseline by more than
+its threshold, so it can gate commits. Each timing is the best of several
+repeats, and a suspected regression is timed again before it counts.
+Benchmarks under a tenth of a millisecond get a wider threshold and
+slowdowns under a microsecond are ignored, as those are mostly noise.
+Timings are only comparable on the machine the baseline was recorded on.
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import sys
+import timeit
+import tracemalloc
+
+from game_logic import WorldMap, GameState, Weapon, WeaponType, CHUNK_SIZE, generate_fort_inventory
+from minigame_engines import (HouseLootEngine, MineshaftEngine, HuntingEngine, Animal, AnimalType,
+                              Enemy, EnemyType, TileType, turns_to_kill)
+import herd
+import hunt_replay
+import dice
+
+BASELINE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "benchmark_baseline.json")
+DEFAULT_THRESHOLD = 0.25  # Allowed slowdown before a benchmark counts as a regression
+MICRO_BENCHMARK = 100e-6  # Baselines faster than this are micro-benchmarks...
+MICRO_THRESHOLD = 0.5  # ...and may slow down this much
+NOISE_FLOOR = 1e-6  # Slowdowns smaller than this many seconds never count
+REPEATS = 7
+CONFIRM_ROUNDS = 3  # Timings of a suspected regression; the best one counts
+SEED = 12345
+
+# name -> (function returning the callable to time, allowed slowdown)
+BENCHMARKS = {}
+
+def benchmark(name, threshold=DEFAULT_THRESHOLD):
+    """Register a setup function; it returns the zero-argument callable that gets timed"""
+    def register(setup):
+        BENCHMARKS[name] = (setup, threshold)
+        return setup
+    return register
+
+
+@benchmark("ensure_terrain_exists_fresh_64x64")
+def bench_ensure_terrain():
+    world = WorldMap(seed=SEED)
+    origin = [0]
+
+    def generate():
+        # Every call generates a region nobody has visited yet
+        origin[0] += 64
+        base_x = origin[0]
+        for y in range(64):
+            for x in range(base_x, base_x + 64):
+                world.ensure_terrain_exists(x, y)
+    return generate
+
+@benchmark("move_player_100_steps")
+def bench_move_player():
+    game = GameState(seed=SEED)
+
+    def walk():
+        for _ in range(100):
+            game.move_player(1, 0)
+    return walk
+
+@benchmark("get_current_terrain_description")
+def bench_terrain_description():
+    game = GameState(seed=SEED)
+    game.move_player(0, 0)
+    return game.get_current_terrain_description
+
+def explored_world(chunks):
+    """World with `chunks` chunks (chunks * 1024 tiles) generated in a row"""
+    world = WorldMap(seed=SEED)
+    world.generate_region(0, 0, chunks * CHUNK_SIZE, CHUNK_SIZE)
+    return world
+
+def played_world(chunks):
+    """explored_world after some play: 1% of tiles changed, forests cut, forts traded with, houses looted"""
+    world = explored_world(chunks)
+    rng = random.Random(SEED)
+    tiles = list(world.map.items())
+    for x, y, tile in rng.sample(tiles, len(tiles) // 100):
+        world.set_terrain(x, y, 'M' if tile == 'P' else 'P')
+    for x, y, tile in tiles:
+        if tile == 'F' and rng.random() < 0.1:
+            world.forest_wood[(x, y)] = rng.randint(1, 19)
+        elif tile == 'F_F':
+            inventory = world.get_fort_inventory(x, y)
+            inventory.pop(rng.randrange(len(inventory)))
+            inventory.append(Weapon(tier=rng.randint(1, 5), rng=rng))
+            world.mark_fort_modified(x, y)
+        elif tile == 'T':
+            world.town_names[(x, y)] = f"Town {x},{y}"
+            for house in range(3):
+                world.mark_house_looted(x, y, house, house)
+    return world
+
+# Saves are deltas against the seed, so they grow with what the player changed
+for chunks, label in ((10, "10k"), (100, "100k")):
+    def setup_to_dict(chunks=chunks):
+        world = played_world(chunks)
+        return world.to_dict
+
+    def setup_from_dict(chunks=chunks):
+        data = played_world(chunks).to_dict()
+        return lambda: WorldMap.from_dict(data)
+
+    benchmark(f"world_to_dict_delta_{label}_tiles")(setup_to_dict)
+    benchmark(f"world_from_dict_delta_{label}_tiles")(setup_from_dict)
+
+@benchmark("house_loot_find_path")
+def bench_find_path():
+    engine = HouseLootEngine(None, rng=random.Random(SEED))
+    # Path across the whole house, to the open tile furthest from the start
+    open_tiles = [(x, y) for y in range(engine.grid_height) for x in range(engine.grid_width)
+                  if engine.is_open((x, y))]
+    goal = max(open_tiles, key=sum)
+    return lambda: engine.find_path((1, 1), goal)
+
+@benchmark("mineshaft_generate_cave")
+def bench_generate_cave():
+    engine = MineshaftEngine(None, rng=random.Random(SEED))
+
+    def generate():
+        engine.tiles = [[TileType.WALL] * engine.grid_size for _ in range(engine.grid_size)]
+        engine.generate_cave()
+    return generate
+
+@benchmark("hunting_shoot_500_animals")
+def bench_hunting_shoot():
+    game = GameState(seed=SEED)
+    game.inventory['bullets'] = 10 ** 9
+    engine = HuntingEngine(game, rng=random.Random(SEED))
+    for _ in range(500):
+        engine.spawn_animal(engine.rng.choice(list(AnimalType)))
+    for animal in engine.animals:
+        animal.health = 10 ** 9  # Keep every animal in the field
+    aim = random.Random(SEED)
+
+    def shoot():
+        engine.last_shot_time = None  # Skip the cooldown
+        engine.step(('shoot', aim.uniform(0, 400), aim.uniform(0, 400)))
+    return shoot
+
+def bench_herd_step():
+    rng = random.Random(SEED)
+    animals = herd.Herd(seed=SEED)
+    animals.extend([rng.choice(list(AnimalType)) for _ in range(1000)],
+                   [rng.uniform(100, 300) for _ in range(1000)], [rng.uniform(100, 300) for _ in range(1000)])
+    animals.hit(list(range(0, 1000, 5)), 1)
+    return animals.step
+
+if herd.np is not None:
+    benchmark("herd_step_1000_animals", threshold=0.4)(bench_herd_step)
+
+@benchmark("hunt_replay_60s")
+def bench_hunt_replay():
+    # Record a full hunt with a shot every second, then time replaying it
+    game = GameState(seed=SEED)
+    game.inventory = {'bullets': 60}
+    recorder = hunt_replay.HuntRecorder(SEED, game)
+    engine = HuntingEngine(game, rng=random.Random(SEED))
+    aim = random.Random(SEED)
+    while not engine.finished:
+        if engine.steps % 20 == 0 and engine.animals:
+            target = aim.choice(engine.animals)
+            action = ('shoot', round(target.x), round(target.y))
+            recorder.record(engine, action)
+            engine.step(action)
+        engine.update()
+    recording = hunt_replay.Recording(recorder.to_bytes(engine))
+    return lambda: hunt_replay.replay(recording, game)
+
+@benchmark("animal_move_1000_animals")
+def bench_animal_move():
+    rng = random.Random(SEED)
+    animals = [Animal(rng.choice(list(AnimalType)), rng.uniform(100, 300), rng.uniform(100, 300), rng)
+               for _ in range(1000)]
+
+    def move():
+        for animal in animals:
+            animal.move()
+    return move
+
+@benchmark("weapon_roll_damage_tier_5", threshold=0.4)
+def bench_roll_damage():
+    weapon = Weapon(weapon_type=WeaponType.COMBAT, tier=5, dice_config=(6, 12, 10))
+    return weapon.roll_damage
+
+@benchmark("enemy_attack_tier_3", threshold=0.4)
+def bench_enemy_attack():
+    return Enemy(EnemyType.KNIGHT).attack
+
+@benchmark("turns_to_kill_all_enemies_tier_5")
+def bench_turns_to_kill():
+    def table():
+        # Uncached, to time the exact calculation itself
+        dice.get_distribution.cache_clear()
+        dice._expected_hits_to_kill.cache_clear()
+        return turns_to_kill((6, 12, 10))
+    return table
+
+@benchmark("generate_fort_inventory")
+def bench_fort_inventory():
+    rng = random.Random(SEED)
+    return lambda: generate_fort_inventory(rng)
+
+# Populations for --memory: name -> function building the i-th object
+POPULATIONS = {
+    'Animal': lambda i, rng: Animal(list(AnimalType)[i % len(AnimalType)], 200, 200, rng),
+    'Enemy': lambda i, rng: Enemy(list(EnemyType)[i % len(EnemyType)]),
+    'Weapon (fort stock)': lambda i, rng: Weapon(tier=i % 5 + 1, rng=rng)
+}
+POPULATION_SIZE = 10000
+
+
+def time_call(func):
+    """Best per-call time over REPEATS runs of an auto-sized loop"""
+    timer = timeit.Timer(func)
+    number, _ = timer.autorange()
+    return min(timer.repeat(repeat=REPEATS, number=number)) / number
+
+def allowed_slowdown(threshold, baseline):
+    """Threshold for a benchmark whose baseline is `baseline` seconds"""
+    if baseline < MICRO_BENCHMARK:
+        return max(threshold, MICRO_THRESHOLD)
+    return threshold
+
+def is_regression(seconds, baseline, threshold):
+    return (seconds / baseline - 1 > allowed_slowdown(threshold, baseline) and
+            seconds - baseline > NOISE_FLOOR)
+
+def bytes_per_object(factory, count=POPULATION_SIZE):
+    """Average memory held by each of count objects built by factory"""
+    rng = random.Random(SEED)
+    tracemalloc.start()
+    try:
+        objects = [factory(i, rng) for i in range(count)]
+        size = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    del objects
+    return size / count
+
+def memory_report():
+    print(f"{'population':40} {'bytes/object':>12} {'total':>12}")
+    for name, factory in POPULATIONS.items():
+        size = bytes_per_object(factory)
+        print(f"{name:40} {size:>12.0f} {size * POPULATION_SIZE / 1e6:>10.1f} MB")
+
+def machine_info():
+    return {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'processor': platform.processor() or platform.machine()
+    }
+
+def load_baseline(path):
+    if not os.path.exists(path):
+        return None
+    with open(path, 'r') as f:
+        return json.load(f)
+
+def format_time(seconds):
+    for unit, scale in (("s", 1), ("ms", 1e-3), ("us", 1e-6)):
+        if seconds >= scale:
+            return f"{seconds / scale:.2f} {unit}"
+    return f"{seconds / 1e-9:.0f} ns"
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the hot path benchmarks")
+    parser.add_argument('-k', dest='filter', default='', help="only run benchmarks containing this")
+    parser.add_argument('--save', action='store_true', help="store the results as the new baseline")
+    parser.add_argument('--baseline', default=BASELINE_FILE)
+    parser.add_argument('--memory', action='store_true', help="report memory per object instead of timing")
+    args = parser.parse_args()
+
+    if args.memory:
+        memory_report()
+        return
+
+    baseline = load_baseline(args.baseline)
+    baseline_results = baseline['results'] if baseline else {}
+    if baseline and baseline.get('machine') != machine_info():
+        print("Warning: baseline was recorded on a different machine or Python:", baseline.get('machine'))
+
+    results = {}
+    regressions = []
+    print(f"{'benchmark':40} {'time':>12} {'baseline':>12} {'change':>8}")
+    for name, (setup, threshold) in BENCHMARKS.items():
+        if args.filter not in name:
+            continue
+        seconds = time_call(setup())
+        previous = baseline_results.get(name)
+        rounds = 1
+        while previous and is_regression(seconds, previous, threshold) and rounds < CONFIRM_ROUNDS:
+            # Confirm before reporting, a busy machine easily slows one measurement
+            seconds = min(seconds, time_call(setup()))
+            rounds += 1
+        results[name] = seconds
+        if previous:
+            change = seconds / previous - 1
+            flag = ""
+            if is_regression(seconds, previous, threshold):
+                regressions.append(name)
+                flag = "  REGRESSION"
+            print(f"{name:40} {format_time(seconds):>12} {format_time(previous):>12} {change:>+7.0%}{flag}")
+        else:
+            print(f"{name:40} {format_time(seconds):>12} {'-':>12} {'new':>8}")
+
+    if args.save:
+        if args.filter and baseline:
+            # Keep the other benchmarks' baselines when only some were run
+            results = {**baseline_results, **results}
+        with open(args.baseline, 'w') as f:
+            json.dump({'machine': machine_info(), 'results': results}, f, indent=4, sort_keys=True)
+        print(f"Baseline saved to {args.baseline}")
+    elif regressions:
+        print(f"{len(regressions)} benchmark(s) slower than the baseline allows: {', '.join(regressions)}")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
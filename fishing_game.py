@@ -1,7 +1,8 @@
 import tkinter as tk
 from tkinter import ttk, messagebox
-import random
 import time
+from minigame_engines import FishingEngine
+import loop_profiler
 
 class FishingGame:
     def __init__(self, parent, game_state):
@@ -9,14 +10,9 @@ class FishingGame:
         self.window.title("Fishing")
         self.game_state = game_state
 
-        # Fish types and their values
-        self.fish_types = ["cod", "bass", "trout", "salmon", "angelfish", "hammerhead shark"]
-
-        # Game state variables
-        self.current_time = 2.0
-        self.current_fish = None
-        self.start_time = None
-        self.score = 0
+        self.engine = FishingEngine(game_state)
+        self.last_tick_time = None
+        self.profiler = None
 
         # Create UI elements
         self.create_ui()
@@ -39,7 +35,7 @@ class FishingGame:
         self.fish_label.pack(pady=20)
 
         # Timer display
-        self.timer_label = ttk.Label(frame, text=f"Time: {self.current_time:.1f}s", 
+        self.timer_label = ttk.Label(frame, text=f"Time: {self.engine.time_limit:.1f}s", 
                                    font=('Helvetica', 12))
         self.timer_label.pack(pady=5)
 
@@ -59,75 +55,69 @@ class FishingGame:
         self.start_button.pack(pady=10)
 
     def start_game(self):
-        if 'fishing_rod' not in self.game_state.inventory:
-            messagebox.showerror("Error", "You need a fishing rod to fish!")
+        self.engine.step(('start',))
+        if self.engine.finished:
+            messagebox.showerror("Error", self.engine.messages[-1])
             self.window.destroy()
             return
 
         # Disable start button
         self.start_button.config(state='disabled')
 
-        # Select and display first fish
-        self.current_fish = random.choice(self.fish_types)
-        self.fish_label.config(text=self.current_fish)
+        # Display first fish
+        self.fish_label.config(text=self.engine.current_fish)
 
         # Clear and focus entry
         self.entry.delete(0, tk.END)
         self.entry.focus()
 
         # Start timer
-        self.start_time = time.time()
+        self.last_tick_time = time.time()
+        self.profiler = loop_profiler.attach("fishing", 100)
         self.update_timer()
 
+    def advance_clock(self):
+        current_time = time.time()
+        self.engine.tick(current_time - self.last_tick_time)
+        self.last_tick_time = current_time
+
     def update_timer(self):
-        if self.start_time is None:
+        if self.last_tick_time is None:
             return
 
-        # Calculate remaining time
-        elapsed = time.time() - self.start_time
-        remaining = max(0, self.current_time - elapsed)
-
-        # Update timer display
-        self.timer_label.config(text=f"Time: {remaining:.1f}s")
+        if self.profiler:
+            self.profiler.tick_started()
+        self.advance_clock()
+        self.timer_label.config(text=f"Time: {self.engine.time_remaining:.1f}s")
+        if self.profiler:
+            self.profiler.tick_finished()
 
-        if remaining > 0:
+        if self.engine.finished:
+            self.game_over()
+        else:
             # Schedule next update
             self.window.after(100, self.update_timer)
-        else:
-            self.game_over()
 
     def check_answer(self, event=None):
-        if self.start_time is None:
+        if self.last_tick_time is None:
             return
 
-        # Get elapsed time and user answer
-        elapsed = time.time() - self.start_time
-        user_answer = self.entry.get().strip()
-
-        # Check if answer is correct and within time limit
-        if elapsed <= self.current_time and user_answer == self.current_fish:
-            # Increase score
-            self.score += 1
-            self.score_label.config(text=f"Fish Caught: {self.score}")
-
-            # Add fish to inventory
-            self.game_state.add_inventory_item(self.current_fish, 1)
+        self.advance_clock()
+        caught_before = self.engine.score
+        self.engine.step(('answer', self.entry.get()))
 
-            # Decrease time for next fish
-            self.current_time = max(0.5, self.current_time - 0.1)
-
-            # Start new round
-            self.start_time = time.time()
-            self.current_fish = random.choice(self.fish_types)
-            self.fish_label.config(text=self.current_fish)
-            self.entry.delete(0, tk.END)
-        elif elapsed > self.current_time:
+        if self.engine.finished:
             self.game_over()
+        elif self.engine.score > caught_before:
+            self.score_label.config(text=f"Fish Caught: {self.engine.score}")
+            self.fish_label.config(text=self.engine.current_fish)
+            self.entry.delete(0, tk.END)
 
     def game_over(self):
-        self.start_time = None
-        messagebox.showinfo("Game Over", 
-                          f"Fishing session ended!\nYou caught {self.score} fish!")
+        self.last_tick_time = None
+        if self.profiler:
+            self.profiler.close()
+        messagebox.showinfo("Game Over", self.engine.messages[-1])
         self.window.destroy()
 
 def start_fishing_game(parent, game_state):
@@ -1,7 +1,7 @@
 import tkinter as tk
 from tkinter import ttk, messagebox, simpledialog
 import styles as st
-from game_logic import GameState, Weapon, WeaponType #Import necessary classes
+from game_logic import GameState, Weapon, WeaponType, ChunkPrefetcher, CHUNK_SIZE #Import necessary classes
 from random import randint, choice
 from collections import deque
 from math import floor
@@ -18,6 +18,46 @@ except ImportError as e:
     print(f"Error importing noise module: {e}")
     traceback.print_exc()
 
+# The world map is composed from cached tile images when Pillow is available,
+# otherwise it falls back to canvas rectangles
+try:
+    from PIL import Image, ImageDraw, ImageTk
+except ImportError:
+    Image = None
+
+# Pre-rendered tiles shared by all map views: (rgb, cell_size) -> PIL image
+TILE_IMAGE_CACHE = {}
+
+def get_tile_image(rgb, cell_size):
+    key = (rgb, cell_size)
+    tile = TILE_IMAGE_CACHE.get(key)
+    if tile is None:
+        tile = Image.new('RGB', (cell_size, cell_size), rgb)
+        # Same outline the rectangle renderer draws
+        ImageDraw.Draw(tile).rectangle((0, 0, cell_size - 1, cell_size - 1), outline=(169, 169, 169))
+        TILE_IMAGE_CACHE[key] = tile
+    return tile
+
+# How often chunks generated in the background are merged into the world (ms)
+PREFETCH_MERGE_INTERVAL = 100
+# Resize events are coalesced into at most one redraw per frame (ms)
+RESIZE_REDRAW_DELAY = 16
+# Tiles per map cell at each zoom level; zoomed-out levels draw chunk summaries
+ZOOM_LEVELS = [1, 2, 4, 8]
+# Cells across the map when zoomed out, so drawing cost doesn't grow with zoom
+ZOOMED_GRID_SIZE = 32
+# Minimap: tiles shown across, size on screen (px) and refresh throttle (ms)
+MINIMAP_SPAN = 96
+MINIMAP_SIZE = 192
+MINIMAP_REFRESH_INTERVAL = 250
+MINIMAP_MARKER_COLORS = {
+    'town': '#FFFFFF',
+    'temple': '#FF0000',
+    'mineshaft': '#FF8C00',
+    'stronghold': '#FF00FF',
+    'fort': '#FFD700'
+}
+
 class WorldMapView(tk.Canvas):
     def __init__(self, parent, game_gui, game):
         super().__init__(parent, width=500, height=500, bg='black')
@@ -25,6 +65,12 @@ class WorldMapView(tk.Canvas):
         self.game_gui = game_gui
         self.base_viewport_size = 12  # Default viewport size
         self.viewport_size = self.get_viewport_size()  # Will be either 12 or 21
+        self.tile_layout = None  # Geometry the tile items were created for
+        self.map_image = None  # Composed viewport when rendering with Pillow
+        self.rgb_colors = {}  # Tk colour name -> RGB tuple
+        self.resize_job = None
+        self.pending_size = None
+        self.zoom = 1  # Tiles per cell, one of ZOOM_LEVELS
         self.colors = {
             'P': 'green',    # Plains
             'T_small': '#6F6F6F',  # Light gray for small towns
@@ -49,62 +95,163 @@ class WorldMapView(tk.Canvas):
         self.root.bind('<Left>', lambda e: self.move_player(-1, 0))
         self.root.bind('<Right>', lambda e: self.move_player(1, 0))
         self.root.bind('<Return>', lambda e: self.interact())
+        self.root.bind('<minus>', lambda e: self.zoom_out())
+        self.root.bind('<plus>', lambda e: self.zoom_in())
+        self.root.bind('<equal>', lambda e: self.zoom_in())
 
         self.bind('<Configure>', self.on_resize)
+        self.bind('<Destroy>', self.on_destroy)
+
+        # Generate terrain around and ahead of the player off the UI thread
+        self.prefetcher = ChunkPrefetcher()
+        self.prefetcher.prefetch(self.game.world, self.game.player_x, self.game.player_y)
+        self.merge_job = self.after(PREFETCH_MERGE_INTERVAL, self.merge_prefetched_chunks)
+
+        # Lay out for the requested size until the first <Configure> arrives
+        self.update_layout(int(self['width']), int(self['height']))
         self.draw_map()
 
     def get_viewport_size(self):
         return 21 if 'advanced_map' in self.game.inventory else self.base_viewport_size
 
     def on_resize(self, event):
-        width = self.winfo_width()
-        height = self.winfo_height()
+        # Dragging a window edge fires many events; only the last size matters
+        self.pending_size = (event.width, event.height)
+        if self.resize_job is None:
+            self.resize_job = self.after(RESIZE_REDRAW_DELAY, self.apply_resize)
+
+    def apply_resize(self):
+        self.resize_job = None
+        self.update_layout(*self.pending_size)
+        self.draw_map()
+
+    def update_layout(self, width, height):
+        """Cache the cell size and centring offsets for a canvas size"""
+        self.canvas_size = (width, height)
         self.viewport_size = self.get_viewport_size()  # Update viewport size
-        self.cell_size = min(width, height) // self.viewport_size
+        self.grid_size = self.viewport_size if self.zoom == 1 else ZOOMED_GRID_SIZE
+        self.cell_size = min(width, height) // self.grid_size
+        self.offset_x = (width - self.cell_size * self.grid_size) // 2
+        self.offset_y = (height - self.cell_size * self.grid_size) // 2
+
+    def set_zoom(self, zoom):
+        self.zoom = zoom
+        self.update_layout(*self.canvas_size)
         self.draw_map()
 
+    def zoom_out(self):
+        index = ZOOM_LEVELS.index(self.zoom)
+        if index + 1 < len(ZOOM_LEVELS):
+            self.set_zoom(ZOOM_LEVELS[index + 1])
+
+    def zoom_in(self):
+        index = ZOOM_LEVELS.index(self.zoom)
+        if index > 0:
+            self.set_zoom(ZOOM_LEVELS[index - 1])
+
+    def merge_prefetched_chunks(self):
+        self.prefetcher.merge_ready(self.game.world)
+        self.merge_job = self.after(PREFETCH_MERGE_INTERVAL, self.merge_prefetched_chunks)
+
+    def on_destroy(self, event):
+        if event.widget is self:
+            self.after_cancel(self.merge_job)
+            if self.resize_job is not None:
+                self.after_cancel(self.resize_job)
+            self.prefetcher.shutdown()
+
     def world_to_screen(self, world_x, world_y):
         view_x = world_x - self.game.player_x + self.viewport_size // 2
         view_y = world_y - self.game.player_y + self.viewport_size // 2
         return view_x, view_y
 
-    def draw_map(self):
+    def get_tile_color(self, x, y):
+        terrain = self.game.world.get_terrain(x, y)
+        if terrain == 'T':
+            town_type = self.game.world.get_town_type(x, y)
+            return self.colors[f'T_{town_type}']
+        elif terrain == 'F':
+            return self.game.world.get_forest_color(x, y)
+        return self.colors[terrain]
+
+    def get_block_color(self, x, y):
+        # Zoomed out: colour of the dominant terrain in the block, without generating anything
+        terrain = self.game.world.map.get_block_summary(x, y, self.zoom)
+        if not terrain:
+            return 'black'  # Unexplored
+        if terrain == 'T':
+            return self.colors['T_medium']
+        return self.colors.get(terrain, 'black')
+
+    def get_rgb(self, color):
+        # Resolve through Tk so names like 'green' match the rectangle renderer
+        rgb = self.rgb_colors.get(color)
+        if rgb is None:
+            rgb = self.rgb_colors[color] = tuple(c // 256 for c in self.winfo_rgb(color))
+        return rgb
+
+    def build_tile_items(self, offset_x, offset_y):
+        """Create the fixed map items; afterwards only changed tiles are redrawn"""
         self.delete('all')
-        width = self.winfo_width()
-        height = self.winfo_height()
-        self.cell_size = min(width, height) // self.viewport_size
-        offset_x = (width - self.cell_size * self.viewport_size) // 2
-        offset_y = (height - self.cell_size * self.viewport_size) // 2
-        min_x = self.game.player_x - self.viewport_size // 2
-        max_x = self.game.player_x + self.viewport_size // 2
-        min_y = self.game.player_y - self.viewport_size // 2
-        max_y = self.game.player_y + self.viewport_size // 2
-        for y in range(min_y, max_y + 1):
-            for x in range(min_x, max_x + 1):
-                terrain = self.game.world.get_terrain(x, y)
-                view_x, view_y = self.world_to_screen(x, y)
-                x1 = view_x * self.cell_size + offset_x
-                y1 = view_y * self.cell_size + offset_y
-                if terrain == 'T':
-                    town_type = self.game.world.get_town_type(x, y)
-                    color = self.colors[f'T_{town_type}']
-                elif terrain == 'F':
-                    color = self.game.world.get_forest_color(x, y)
-                elif terrain.startswith('S'): # Stronghold
-                    color = self.colors[terrain]
-                elif terrain == 'F_F': #Fort
-                    color = self.colors['F_F']
-                else:
-                    color = self.colors[terrain]
-                self.create_rectangle(x1, y1, 
-                                        x1 + self.cell_size, 
-                                        y1 + self.cell_size, 
-                                        fill=color,
-                                        outline='dark gray')
-        player_x = (self.viewport_size // 2) * self.cell_size + offset_x + self.cell_size/2
-        player_y = (self.viewport_size // 2) * self.cell_size + offset_y + self.cell_size/2
-        self.create_text(player_x, player_y, text='@', 
-                            fill=self.colors['@'], font=('Courier', 14, 'bold'))
+        count = self.grid_size * self.grid_size
+        self.tile_colors = [None] * count
+        if Image is not None:
+            # One image item for the whole viewport, composed from cached tiles
+            size = self.grid_size * self.cell_size
+            self.map_image = Image.new('RGB', (size, size))
+            self.map_photo = ImageTk.PhotoImage(self.map_image)
+            self.create_image(offset_x, offset_y, image=self.map_photo, anchor='nw')
+        else:
+            self.tile_items = []
+            for view_y in range(self.grid_size):
+                for view_x in range(self.grid_size):
+                    x1 = view_x * self.cell_size + offset_x
+                    y1 = view_y * self.cell_size + offset_y
+                    self.tile_items.append(self.create_rectangle(x1, y1,
+                                                                 x1 + self.cell_size,
+                                                                 y1 + self.cell_size,
+                                                                 fill='black',
+                                                                 outline='dark gray'))
+        player_x = (self.grid_size // 2) * self.cell_size + offset_x + self.cell_size/2
+        player_y = (self.grid_size // 2) * self.cell_size + offset_y + self.cell_size/2
+        self.player_item = self.create_text(player_x, player_y, text='@', 
+                                            fill=self.colors['@'], font=('Courier', 14, 'bold'))
+
+    def draw_map(self):
+        if self.cell_size <= 0:
+            return  # Canvas too small to show anything
+
+        # Items are only recreated when the grid geometry changes
+        layout = (self.grid_size, self.cell_size, self.offset_x, self.offset_y)
+        if layout != self.tile_layout:
+            self.tile_layout = layout
+            self.build_tile_items(self.offset_x, self.offset_y)
+
+        # Scrolling just recolours the fixed grid; unchanged tiles cost nothing.
+        # Zoomed-out cells are aligned to zoom-sized blocks so they map onto
+        # the cached chunk summaries.
+        zoom = self.zoom
+        min_x = (self.game.player_x // zoom - self.grid_size // 2) * zoom
+        min_y = (self.game.player_y // zoom - self.grid_size // 2) * zoom
+        get_color = self.get_tile_color if zoom == 1 else self.get_block_color
+        changed = False
+        index = 0
+        for view_y in range(self.grid_size):
+            for view_x in range(self.grid_size):
+                color = get_color(min_x + view_x * zoom, min_y + view_y * zoom)
+                if color != self.tile_colors[index]:
+                    self.tile_colors[index] = color
+                    changed = True
+                    if self.map_image is not None:
+                        tile = get_tile_image(self.get_rgb(color), self.cell_size)
+                        self.map_image.paste(tile, (view_x * self.cell_size, view_y * self.cell_size))
+                    else:
+                        self.itemconfig(self.tile_items[index], fill=color)
+                index += 1
+
+        # A single blit of the composed viewport per frame
+        if changed and self.map_image is not None:
+            self.map_photo.paste(self.map_image)
 
     def move_player(self, dx, dy):
         new_x = self.game.player_x + dx
@@ -116,6 +263,7 @@ class WorldMapView(tk.Canvas):
 
         success, message = self.game.move_player(dx, dy)
         if success:
+            self.prefetcher.prefetch(self.game.world, self.game.player_x, self.game.player_y, dx, dy)
             self.draw_map()
             self.game_gui.append_to_output(message)
             self.game_gui.update_action_buttons()
@@ -162,6 +310,114 @@ class WorldMapView(tk.Canvas):
 
 
 
+class MinimapView(tk.Canvas):
+    """Overview of explored tiles, kept as a one-pixel-per-tile Pillow bitmap.
+
+    The bitmap is painted from WorldMap tile notifications, so each update
+    costs only the new tiles; only the window around the player is scaled
+    onto the canvas.
+    """
+
+    def __init__(self, parent, world_map_view, game):
+        super().__init__(parent, width=MINIMAP_SIZE, height=MINIMAP_SIZE, bg='black',
+                         highlightthickness=1, highlightbackground='dark gray')
+        self.world_map_view = world_map_view
+        self.game = game
+        self.world = None
+        self.photo = None
+        self.shown_position = None
+        self.dirty = False
+        self.image_item = self.create_image(0, 0, anchor='nw')
+        self.set_world(game.world)
+        self.bind('<Destroy>', self.on_destroy)
+        self.refresh_job = self.after(MINIMAP_REFRESH_INTERVAL, self.refresh)
+
+    def set_world(self, world):
+        """Start over for a (new or loaded) world, painting what is already explored"""
+        if self.world is not None:
+            self.world.remove_tile_listener(self.on_tile)
+        self.world = world
+        self.origin_x = self.origin_y = -2 * CHUNK_SIZE
+        self.image = Image.new('RGB', (4 * CHUNK_SIZE, 4 * CHUNK_SIZE))
+        self.pixels = self.image.load()
+        for (cx, cy), chunk in world.map.chunks.items():
+            for index, code in enumerate(chunk.tiles):
+                if code:
+                    self.on_tile(cx * CHUNK_SIZE + index % CHUNK_SIZE,
+                                 cy * CHUNK_SIZE + index // CHUNK_SIZE,
+                                 world.map.palette[code])
+        world.add_tile_listener(self.on_tile)
+        self.dirty = True
+
+    def on_tile(self, x, y, terrain):
+        px = x - self.origin_x
+        py = y - self.origin_y
+        width, height = self.image.size
+        if not (0 <= px < width and 0 <= py < height):
+            self.grow(x, y)
+            px = x - self.origin_x
+            py = y - self.origin_y
+        if terrain == 'T':
+            color = self.world_map_view.colors[f'T_{self.world.get_town_type(x, y)}']
+        else:
+            color = self.world_map_view.colors.get(terrain, 'black')
+        self.pixels[px, py] = self.world_map_view.get_rgb(color)
+        self.dirty = True
+
+    def grow(self, x, y):
+        # Double the bitmap towards the new tile so growth is amortised O(1) per tile
+        width, height = self.image.size
+        left, top = self.origin_x, self.origin_y
+        right, bottom = left + width, top + height
+        while x < left:
+            left -= right - left
+        while x >= right:
+            right += right - left
+        while y < top:
+            top -= bottom - top
+        while y >= bottom:
+            bottom += bottom - top
+        image = Image.new('RGB', (right - left, bottom - top))
+        image.paste(self.image, (self.origin_x - left, self.origin_y - top))
+        self.image = image
+        self.pixels = image.load()
+        self.origin_x, self.origin_y = left, top
+
+    def refresh(self):
+        position = (self.game.player_x, self.game.player_y)
+        if self.dirty or position != self.shown_position:
+            self.dirty = False
+            self.shown_position = position
+            self.draw(*position)
+        self.refresh_job = self.after(MINIMAP_REFRESH_INTERVAL, self.refresh)
+
+    def draw(self, player_x, player_y):
+        left = player_x - MINIMAP_SPAN // 2
+        top = player_y - MINIMAP_SPAN // 2
+        scale = MINIMAP_SIZE / MINIMAP_SPAN
+        # Crop pads anything outside the bitmap with black (unexplored)
+        window = self.image.crop((left - self.origin_x, top - self.origin_y,
+                                  left - self.origin_x + MINIMAP_SPAN, top - self.origin_y + MINIMAP_SPAN))
+        self.photo = ImageTk.PhotoImage(window.resize((MINIMAP_SIZE, MINIMAP_SIZE), Image.NEAREST))
+        self.itemconfig(self.image_item, image=self.photo)
+
+        self.delete('marker')
+        bbox = (left, top, left + MINIMAP_SPAN - 1, top + MINIMAP_SPAN - 1)
+        for kind, color in MINIMAP_MARKER_COLORS.items():
+            for x, y in self.world.within(kind, bbox):
+                sx = (x - left + 0.5) * scale
+                sy = (y - top + 0.5) * scale
+                self.create_rectangle(sx - 2, sy - 2, sx + 2, sy + 2, fill=color,
+                                      outline='black', tags='marker')
+        center = (MINIMAP_SPAN // 2 + 0.5) * scale
+        self.create_oval(center - 3, center - 3, center + 3, center + 3,
+                         fill=self.world_map_view.colors['@'], outline='black', tags='marker')
+
+    def on_destroy(self, event):
+        if event.widget is self:
+            self.after_cancel(self.refresh_job)
+            self.world.remove_tile_listener(self.on_tile)
+
 class InventoryWindow:
     def __init__(self, parent, game):
         self.window = tk.Toplevel(parent)
@@ -525,6 +781,12 @@ class GameGUI:
         right_frame = ttk.Frame(self.main_frame)
         right_frame.grid(row=0, column=1, sticky="n", padx=5, pady=5)
 
+        # Minimap of explored terrain (needs Pillow)
+        self.minimap = None
+        if Image is not None:
+            self.minimap = MinimapView(right_frame, self.world_map, self.game)
+            self.minimap.pack(pady=(0, 5))
+
         # Buttons frame
         buttons_frame = ttk.Frame(right_frame)
         buttons_frame.pack(fill=tk.X)
@@ -547,6 +809,12 @@ class GameGUI:
         ttk.Button(buttons_frame, text="Smaller Window", 
                   command=self.decrease_window_size).pack(pady=2, fill=tk.X)
 
+        # Map zoom buttons (also bound to + and -)
+        ttk.Button(buttons_frame, text="Zoom Out Map", 
+                  command=self.world_map.zoom_out).pack(pady=2, fill=tk.X)
+        ttk.Button(buttons_frame, text="Zoom In Map", 
+                  command=self.world_map.zoom_in).pack(pady=2, fill=tk.X)
+
         # Save/Load buttons
         ttk.Button(buttons_frame, text="Save Game", 
                   command=self.save_game).pack(pady=2, fill=tk.X)
@@ -763,6 +1031,8 @@ class GameGUI:
                 # Load the game data into the current game state
                 self.game.from_dict(game_data)
                 self.world_map.draw_map()
+                if self.minimap is not None:
+                    self.minimap.set_world(self.game.world)
                 self.update_inventory_display()
                 self.append_to_output(f"Game '{save_name}' loaded successfully!")
                 messagebox.showinfo("Load Game", f"Game '{save_name}' loaded successfully!")
@@ -1299,7 +1569,7 @@ class GameGUI:
         status = "with" if has_lights else "without"
         if has_lights:
             from house_loot_game import start_house_loot_game
-            start_house_loot_game(parent, self.game)
+            start_house_loot_game(parent, self.game, town_type)
         else:
             if randint(0, 1) == 1:
                 town_probabilities = {
@@ -1,12 +1,16 @@
 import json
 import os
-from random import randint, choice, random, uniform, seed
+from random import random, uniform, seed
 from math import floor
-from collections import defaultdict
+from collections import defaultdict, Counter
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from itertools import repeat
 import random
 from enum import Enum
 import noise
 import uuid
+from dice import get_distribution
 
 # Weapon system revamp
 class WeaponTier(Enum):
@@ -24,6 +28,11 @@ class WeaponType(Enum):
     HUNTING_RIFLE = "hunting_rifle"
 
 class Weapon:
+    # Slotted: every fort's shop inventory holds a set of these
+    __slots__ = ('id', 'weapon_type', 'tier', 'name', 'dice_config', 'num_dice', 'dice_sides',
+                 'modifier', 'avg_damage', 'last_shot_time', 'is_reloading', 'reload_start_time',
+                 'upgrade_level')
+
     # Dice configurations for each tier (number of dice, sides per dice, modifier)
     dice_configs = {
         1: (1, 6, 2),    # 1d6+2 (avg: 5.5)
@@ -33,6 +42,20 @@ class Weapon:
         5: (6, 12, 10)   # 6d12+10 (avg: 49)
     }
 
+    # Dice a new weapon picks from, by tier; similar power to the tier's default
+    dice_options = {
+        # Tier 1: Variations like 1d6+2, 1d8+1, 2d4+1, etc.
+        1: [(1, 6, 2), (1, 8, 1), (2, 4, 1), (2, 3, 2)],
+        # Tier 2: Variations like 2d6+2, 3d4+2, 2d8+1, 1d10+4, etc.
+        2: [(2, 6, 2), (3, 4, 2), (2, 8, 1), (1, 10, 4), (2, 5, 3)],
+        # Tier 3: Variations like 3d8+4, 2d12+2, 4d6+3, etc.
+        3: [(3, 8, 4), (2, 12, 2), (4, 6, 3), (3, 10, 2), (5, 4, 5)],
+        # Tier 4: Variations like 4d10+6, 6d6+8, 3d12+8, etc.
+        4: [(4, 10, 6), (6, 6, 8), (3, 12, 8), (5, 8, 6), (4, 12, 4)],
+        # Tier 5: Variations like 6d12+10, 8d8+12, 5d20+5, etc.
+        5: [(6, 12, 10), (8, 8, 12), (5, 20, 5), (7, 10, 10), (10, 6, 15)]
+    }
+
     # Base damage range for each tier (for cost calculations)
     damage_ranges = {
         1: (4, 8),
@@ -42,43 +65,47 @@ class Weapon:
         5: (28, 82)
     }
 
-    def __init__(self, weapon_id=None, name=None, weapon_type=WeaponType.COMBAT, tier=1, dice_config=None):
-        self.id = weapon_id or str(uuid.uuid4())
+    # Words weapon names are made of
+    name_prefixes = [
+        "Rusty", "Ancient", "Gleaming", "Shadow", "Light", "Burning", 
+        "Frozen", "Mystic", "Arcane", "Divine", "Infernal", "Blessed", 
+        "Cursed", "Royal", "Forgotten", "Deadly", "Swift", "Mighty",
+        "Vengeful", "Savage", "Precise", "Brutal", "Elegant", "Vicious"
+    ]
+
+    name_types = [
+        "Blade", "Sword", "Saber", "Rapier", "Claymore", "Dagger", 
+        "Slicer", "Cutter", "Reaver", "Fang", "Edge", "Bane", 
+        "Slayer", "Cleaver", "Maul", "Destroyer", "Vanquisher"
+    ]
+
+    name_suffixes = [
+        "of Power", "of Might", "of Glory", "of Triumph", "of Victory",
+        "of Ruin", "of Doom", "of Despair", "of Sorrow", "of Agony",
+        "of Souls", "of Eternity", "of Infinity", "of the Lion", 
+        "of the Dragon", "of the Phoenix", "of the Serpent"
+    ]
+
+    def __init__(self, weapon_id=None, name=None, weapon_type=WeaponType.COMBAT, tier=1, dice_config=None, rng=None):
+        # A seeded rng makes the whole weapon (id, name, dice) reproducible
+        if rng is None:
+            rng = random
+            self.id = weapon_id or str(uuid.uuid4())
+        else:
+            self.id = weapon_id or str(uuid.UUID(int=rng.getrandbits(128), version=4))
         self.weapon_type = weapon_type
         self.tier = tier
 
         # Generate name if not provided
-        self.name = name or self.generate_name()
+        self.name = name or self.generate_name(rng)
 
         # Set dice configuration for the weapon - randomized within tier
         if dice_config:
             self.dice_config = dice_config
         else:
-            # Get the default configuration for this tier as a starting point
-            default_config = self.dice_configs[self.tier]
-            
             # Randomize the dice configuration while keeping overall power level similar
-            if self.tier == 1:
-                # Tier 1: Variations like 1d6+2, 1d8+1, 2d4+1, etc.
-                dice_options = [(1, 6, 2), (1, 8, 1), (2, 4, 1), (2, 3, 2)]
-                self.dice_config = choice(dice_options)  # Use 'choice' from random imported at the top
-            elif self.tier == 2:
-                # Tier 2: Variations like 2d6+2, 3d4+2, 2d8+1, 1d10+4, etc.
-                dice_options = [(2, 6, 2), (3, 4, 2), (2, 8, 1), (1, 10, 4), (2, 5, 3)]
-                self.dice_config = choice(dice_options)
-            elif self.tier == 3:
-                # Tier 3: Variations like 3d8+4, 2d12+2, 4d6+3, etc.
-                dice_options = [(3, 8, 4), (2, 12, 2), (4, 6, 3), (3, 10, 2), (5, 4, 5)]
-                self.dice_config = choice(dice_options)
-            elif self.tier == 4:
-                # Tier 4: Variations like 4d10+6, 6d6+8, 3d12+8, etc.
-                dice_options = [(4, 10, 6), (6, 6, 8), (3, 12, 8), (5, 8, 6), (4, 12, 4)]
-                self.dice_config = choice(dice_options)
-            else:  # Tier 5
-                # Tier 5: Variations like 6d12+10, 8d8+12, 5d20+5, etc.
-                dice_options = [(6, 12, 10), (8, 8, 12), (5, 20, 5), (7, 10, 10), (10, 6, 15)]
-                self.dice_config = choice(dice_options)
-        
+            self.dice_config = rng.choice(self.dice_options[self.tier])
+
         self.num_dice = self.dice_config[0]
         self.dice_sides = self.dice_config[1]
         self.modifier = self.dice_config[2]
@@ -91,34 +118,14 @@ class Weapon:
         self.reload_start_time = 0
         self.upgrade_level = 0
 
-    def generate_name(self):
-        prefixes = [
-            "Rusty", "Ancient", "Gleaming", "Shadow", "Light", "Burning", 
-            "Frozen", "Mystic", "Arcane", "Divine", "Infernal", "Blessed", 
-            "Cursed", "Royal", "Forgotten", "Deadly", "Swift", "Mighty",
-            "Vengeful", "Savage", "Precise", "Brutal", "Elegant", "Vicious"
-        ]
-
-        weapon_types = [
-            "Blade", "Sword", "Saber", "Rapier", "Claymore", "Dagger", 
-            "Slicer", "Cutter", "Reaver", "Fang", "Edge", "Bane", 
-            "Slayer", "Cleaver", "Maul", "Destroyer", "Vanquisher"
-        ]
-
-        suffixes = [
-            "of Power", "of Might", "of Glory", "of Triumph", "of Victory",
-            "of Ruin", "of Doom", "of Despair", "of Sorrow", "of Agony",
-            "of Souls", "of Eternity", "of Infinity", "of the Lion", 
-            "of the Dragon", "of the Phoenix", "of the Serpent"
-        ]
-
+    def generate_name(self, rng=random):
         # Higher tier weapons get more elaborate names
         if self.tier >= 3:
-            return f"{choice(prefixes)} {choice(weapon_types)} {choice(suffixes)}"
+            return f"{rng.choice(self.name_prefixes)} {rng.choice(self.name_types)} {rng.choice(self.name_suffixes)}"
         elif self.tier == 2:
-            return f"{choice(prefixes)} {choice(weapon_types)}"
+            return f"{rng.choice(self.name_prefixes)} {rng.choice(self.name_types)}"
         else:
-            return f"{choice(weapon_types)}"
+            return f"{rng.choice(self.name_types)}"
 
     def calculate_avg_damage(self):
         """Calculate the average damage for this weapon based on dice configuration"""
@@ -126,12 +133,10 @@ class Weapon:
         avg = (self.dice_sides + 1) / 2 * self.num_dice + self.modifier
         return round(avg, 1)
         
-    def roll_damage(self):
+    def roll_damage(self, rng=random):
         """Roll the dice to determine actual damage dealt"""
-        # Roll each die and add them up
-        total = sum(randint(1, self.dice_sides) for _ in range(self.num_dice))
-        # Add the modifier
-        return total + self.modifier
+        # One draw from the dice's exact distribution; upgrades change the dice, so look it up each time
+        return get_distribution((self.num_dice, self.dice_sides, self.modifier)).sample(rng)
         
     def generate_damage(self):
         """Legacy method for backward compatibility"""
@@ -229,44 +234,383 @@ class Weapon:
         }
 
 # Generate weapon shop inventory for forts
-def generate_fort_inventory():
+def generate_fort_inventory(rng=None):
     inventory = []
     # One weapon from each tier
     for tier in range(1, 6):
-        weapon = Weapon(tier=tier, weapon_type=WeaponType.COMBAT)
+        weapon = Weapon(tier=tier, weapon_type=WeaponType.COMBAT, rng=rng)
         inventory.append(weapon)
     return inventory
 
-class WorldMap:
+# Chunked tile storage
+CHUNK_SIZE = 32
+
+# Palette of tile codes; code 0 marks a tile that hasn't been generated yet
+TILE_PALETTE = ['', 'P', 'T', 'X', 'M', 'O', 'B', 'C', 'F', 'S1', 'S2', 'S3', 'F_F']
+TILE_CODES = {tile: code for code, tile in enumerate(TILE_PALETTE)}
+# Points of interest kept in WorldMap.poi_index, by terrain
+POI_KINDS = {
+    'T': 'town',
+    'X': 'temple',
+    'M': 'mineshaft',
+    'S1': 'stronghold',
+    'S2': 'stronghold',
+    'S3': 'stronghold',
+    'F_F': 'fort'
+}
+# Generated tiles that need bookkeeping in WorldMap.register_feature
+FEATURE_CODES = frozenset(TILE_CODES[tile] for tile in POI_KINDS)
+
+class TileChunk:
+    def __init__(self):
+        self.tiles = bytearray(CHUNK_SIZE * CHUNK_SIZE)
+        self.count = 0  # Number of generated tiles in this chunk
+        self.summaries = {}  # block size -> dominant tile code per block
+
+    def summary(self, block):
+        """Most common generated tile code in each block x block square (0 if none)"""
+        codes = self.summaries.get(block)
+        if codes is None:
+            blocks = CHUNK_SIZE // block
+            codes = bytearray(blocks * blocks)
+            for by in range(blocks):
+                for bx in range(blocks):
+                    counts = Counter()
+                    for y in range(by * block, (by + 1) * block):
+                        row = y * CHUNK_SIZE
+                        counts.update(self.tiles[row + bx * block:row + (bx + 1) * block])
+                    del counts[0]
+                    if counts:
+                        codes[by * blocks + bx] = counts.most_common(1)[0][0]
+            codes = self.summaries[block] = bytes(codes)
+        return codes
+
+class ChunkedTileStore:
+    """Stores world tiles as one-byte palette codes in fixed-size square chunks"""
+
     def __init__(self):
-        self.map = defaultdict(lambda: defaultdict(str))
+        self.chunks = {}
+        self.palette = list(TILE_PALETTE)
+        self.codes = dict(TILE_CODES)
+
+    def code_for(self, tile):
+        code = self.codes.get(tile)
+        if code is None:
+            # Unknown tiles (e.g. from older saves) extend the palette
+            if len(self.palette) >= 256:
+                raise ValueError(f"Tile palette is full, cannot store {tile!r}")
+            code = len(self.palette)
+            self.palette.append(tile)
+            self.codes[tile] = code
+        return code
+
+    def get_chunk(self, cx, cy):
+        return self.chunks.get((cx, cy))
+
+    def is_chunk_complete(self, cx, cy):
+        chunk = self.chunks.get((cx, cy))
+        return chunk is not None and chunk.count == CHUNK_SIZE * CHUNK_SIZE
+
+    def get(self, x, y):
+        # Looking up an ungenerated tile never allocates anything
+        chunk = self.chunks.get((x // CHUNK_SIZE, y // CHUNK_SIZE))
+        if chunk is None:
+            return ''
+        return self.palette[chunk.tiles[(y % CHUNK_SIZE) * CHUNK_SIZE + x % CHUNK_SIZE]]
+
+    def set(self, x, y, tile):
+        key = (x // CHUNK_SIZE, y // CHUNK_SIZE)
+        chunk = self.chunks.get(key)
+        if chunk is None:
+            chunk = self.chunks[key] = TileChunk()
+        index = (y % CHUNK_SIZE) * CHUNK_SIZE + x % CHUNK_SIZE
+        code = self.code_for(tile)
+        old_code = chunk.tiles[index]
+        if code != old_code:
+            chunk.tiles[index] = code
+            chunk.count += (code != 0) - (old_code != 0)
+            chunk.summaries.clear()
+
+    def get_block_summary(self, x, y, block):
+        """Dominant tile of the block x block square containing (x, y); '' if unexplored"""
+        chunk = self.chunks.get((x // CHUNK_SIZE, y // CHUNK_SIZE))
+        if chunk is None:
+            return ''
+        blocks = CHUNK_SIZE // block
+        index = (y % CHUNK_SIZE) // block * blocks + (x % CHUNK_SIZE) // block
+        return self.palette[chunk.summary(block)[index]]
+
+    def items(self):
+        """Yield (x, y, tile) for every generated tile"""
+        palette = self.palette
+        for (cx, cy), chunk in self.chunks.items():
+            base_x = cx * CHUNK_SIZE
+            base_y = cy * CHUNK_SIZE
+            for index, code in enumerate(chunk.tiles):
+                if code:
+                    yield base_x + index % CHUNK_SIZE, base_y + index // CHUNK_SIZE, palette[code]
+
+    def __len__(self):
+        return sum(chunk.count for chunk in self.chunks.values())
+
+class PointIndex:
+    """Points of interest bucketed on a uniform grid, one bucket map per kind"""
+
+    def __init__(self, bucket_size=CHUNK_SIZE):
+        self.bucket_size = bucket_size
+        self.buckets = defaultdict(dict)  # kind -> {(bx, by): [(x, y), ...]}
+        self.bounds = {}  # kind -> (min_bx, min_by, max_bx, max_by)
+
+    def add(self, kind, x, y):
+        key = (x // self.bucket_size, y // self.bucket_size)
+        bucket = self.buckets[kind].setdefault(key, [])
+        if (x, y) in bucket:
+            return
+        bucket.append((x, y))
+        bx, by = key
+        bounds = self.bounds.get(kind)
+        if bounds is None:
+            self.bounds[kind] = (bx, by, bx, by)
+        else:
+            self.bounds[kind] = (min(bounds[0], bx), min(bounds[1], by),
+                                 max(bounds[2], bx), max(bounds[3], by))
+
+    def remove(self, kind, x, y):
+        key = (x // self.bucket_size, y // self.bucket_size)
+        bucket = self.buckets[kind].get(key)
+        if bucket and (x, y) in bucket:
+            bucket.remove((x, y))
+            if not bucket:
+                del self.buckets[kind][key]
+
+    def within(self, kind, bbox):
+        """All points of a kind with x0 <= x <= x1 and y0 <= y <= y1"""
+        x0, y0, x1, y1 = bbox
+        size = self.bucket_size
+        kind_buckets = self.buckets.get(kind, {})
+        found = []
+        for by in range(y0 // size, y1 // size + 1):
+            for bx in range(x0 // size, x1 // size + 1):
+                for x, y in kind_buckets.get((bx, by), ()):
+                    if x0 <= x <= x1 and y0 <= y <= y1:
+                        found.append((x, y))
+        return found
+
+    def nearest(self, kind, x, y, max_radius=None):
+        """Closest point of a kind (euclidean), searching outwards ring by ring"""
+        kind_buckets = self.buckets.get(kind)
+        if not kind_buckets:
+            return None
+        size = self.bucket_size
+        cbx, cby = x // size, y // size
+        min_bx, min_by, max_bx, max_by = self.bounds[kind]
+        max_ring = max(cbx - min_bx, max_bx - cbx, cby - min_by, max_by - cby)
+        best = None
+        best_dist = None
+        for ring in range(max_ring + 1):
+            for bx in range(cbx - ring, cbx + ring + 1):
+                # Only the outline of the ring; the inside was searched already
+                step = 1 if abs(bx - cbx) == ring else 2 * ring
+                for by in range(cby - ring, cby + ring + 1, max(1, step)):
+                    for px, py in kind_buckets.get((bx, by), ()):
+                        dist = (px - x) ** 2 + (py - y) ** 2
+                        if best_dist is None or dist < best_dist:
+                            best, best_dist = (px, py), dist
+            # Anything beyond this ring is at least ring * size + 1 tiles away
+            reach = ring * size + 1
+            if best_dist is not None and best_dist <= reach * reach:
+                break
+            if max_radius is not None and reach > max_radius:
+                break
+        if best is not None and max_radius is not None and best_dist > max_radius * max_radius:
+            return None
+        return best
+
+# Ocean masks cover a chunk plus an apron wide enough to classify coast tiles
+# (ocean next to a beach) on the chunk edge without sampling noise again
+OCEAN_APRON = 2
+OCEAN_MASK_SIZE = CHUNK_SIZE + 2 * OCEAN_APRON
+OCEAN_NEIGHBOURS = (1, -1, OCEAN_MASK_SIZE, -OCEAN_MASK_SIZE)
+
+def ocean_noise(x, y, seed):
+    scale = 15.0
+    octaves = 1
+    persistence = 0.5
+    lacunarity = 2.0
+    return noise.pnoise2(x/scale, 
+                         y/scale, 
+                         octaves=octaves, 
+                         persistence=persistence,
+                         lacunarity=lacunarity,
+                         repeatx=1000,
+                         repeaty=1000,
+                         base=seed)
+
+def generate_ocean_mask(cx, cy, seed):
+    """Sample the noise field once per tile for a chunk and its apron (1 = ocean)"""
+    mask = bytearray(OCEAN_MASK_SIZE * OCEAN_MASK_SIZE)
+    x0 = cx * CHUNK_SIZE - OCEAN_APRON
+    y0 = cy * CHUNK_SIZE - OCEAN_APRON
+    index = 0
+    for y in range(y0, y0 + OCEAN_MASK_SIZE):
+        for x in range(x0, x0 + OCEAN_MASK_SIZE):
+            if ocean_noise(x, y, seed) < -0.1:
+                mask[index] = 1
+            index += 1
+    return mask
+
+# Bound on cached ocean masks (~1.3 KB each) so long explorations stay capped
+OCEAN_MASK_CACHE_SIZE = 512
+
+@lru_cache(maxsize=OCEAN_MASK_CACHE_SIZE)
+def cached_ocean_mask(cx, cy, seed):
+    """LRU-cached ocean mask keyed by chunk and seed; see cache_info() for hits/misses"""
+    return bytes(generate_ocean_mask(cx, cy, seed))
+
+def ocean_mask_index(local_x, local_y):
+    return (local_y + OCEAN_APRON) * OCEAN_MASK_SIZE + local_x + OCEAN_APRON
+
+def classify_water_tile(mask, index):
+    """Return 'P' for land, 'B' for beach, 'C' for coast or 'O' for deep ocean"""
+    if not mask[index]:
+        return 'P'
+
+    for offset in OCEAN_NEIGHBOURS:
+        if not mask[index + offset]:
+            return 'B'
+
+    # Ocean bordering a beach is coastline
+    for offset in OCEAN_NEIGHBOURS:
+        neighbour = index + offset
+        for neighbour_offset in OCEAN_NEIGHBOURS:
+            if not mask[neighbour + neighbour_offset]:
+                return 'C'
+
+    return 'O'
+
+# Bump when generate_terrain changes so delta saves can tell which rules made them
+WORLD_GENERATOR_VERSION = 1
+
+# Deterministic feature placement: every roll is a hash of (seed, x, y, salt),
+# so any tile can be regenerated on demand regardless of visiting order
+MASK_64 = (1 << 64) - 1
+FEATURE_ROLL = 0
+FEATURE_DETAIL = 1
+FORT_INVENTORY = 2
+FOREST_SPREAD = 3  # One salt per spread direction, FOREST_SPREAD + i
+FOREST_SPREAD_DIRECTIONS = [(0, 1), (1, 0), (0, -1), (-1, 0)]
+
+def tile_hash(seed, x, y, salt=0):
+    """64-bit splitmix-style hash of a tile coordinate"""
+    h = (seed * 0x9E3779B97F4A7C15 + x * 0xC2B2AE3D27D4EB4F
+         + y * 0x165667B19E3779F9 + salt * 0xD6E8FEB86659FD93) & MASK_64
+    h = ((h ^ (h >> 30)) * 0xBF58476D1CE4E5B9) & MASK_64
+    h = ((h ^ (h >> 27)) * 0x94D049BB133111EB) & MASK_64
+    return h ^ (h >> 31)
+
+def tile_roll(seed, x, y, salt=0):
+    """Uniform float in [0, 1) derived from the tile coordinate"""
+    return (tile_hash(seed, x, y, salt) >> 11) / 9007199254740992.0
+
+def water_tile_type(seed, x, y):
+    cx, cy = x // CHUNK_SIZE, y // CHUNK_SIZE
+    mask = cached_ocean_mask(cx, cy, seed)
+    return classify_water_tile(mask, ocean_mask_index(x - cx * CHUNK_SIZE, y - cy * CHUNK_SIZE))
+
+def roll_land_feature(seed, x, y):
+    """Feature rolled for a land tile, returned as (terrain, town_type)"""
+    roll = tile_roll(seed, x, y, FEATURE_ROLL)
+    if roll < 0.1:  # 10% chance for town
+        detail = tile_hash(seed, x, y, FEATURE_DETAIL)
+        return 'T', ['small', 'medium', 'large'][detail % 3]
+    elif roll < 0.15:  # 5% chance for temple
+        return 'X', None
+    elif roll < 0.17:  # 2% chance for mineshaft
+        return 'M', None
+    elif roll < 0.20:  # 3% chance for stronghold
+        tier = tile_hash(seed, x, y, FEATURE_DETAIL) % 3 + 1
+        return f'S{tier}', None  # S1, S2, or S3 for different tiers
+    elif roll < 0.30:  # 10% chance for forest
+        return 'F', None
+    elif roll < 0.32: #2% chance for fort
+        return 'F_F', None
+    return 'P', None
+
+def generate_terrain(seed, x, y):
+    """Terrain of a fresh tile as (terrain, town_type), a pure function of seed and position"""
+    tile_type = water_tile_type(seed, x, y)
+
+    # Handle water-related tiles first
+    if tile_type in ['O', 'B', 'C']:
+        return tile_type, None
+
+    terrain, town_type = roll_land_feature(seed, x, y)
+    if terrain != 'P':
+        return terrain, town_type
+
+    # Forests spread into neighbouring plains (70% chance per direction)
+    for index, (dx, dy) in enumerate(FOREST_SPREAD_DIRECTIONS):
+        nx, ny = x - dx, y - dy
+        if (roll_land_feature(seed, nx, ny)[0] == 'F' and
+                tile_roll(seed, nx, ny, FOREST_SPREAD + index) < 0.7 and
+                water_tile_type(seed, nx, ny) == 'P'):
+            return 'F', None
+
+    return 'P', None
+
+def generate_chunk(seed, cx, cy):
+    """Tile codes (TILE_PALETTE indices) for a whole chunk, safe to run off the main thread"""
+    codes = bytearray(CHUNK_SIZE * CHUNK_SIZE)
+    base_x = cx * CHUNK_SIZE
+    base_y = cy * CHUNK_SIZE
+    index = 0
+    for y in range(base_y, base_y + CHUNK_SIZE):
+        for x in range(base_x, base_x + CHUNK_SIZE):
+            codes[index] = TILE_CODES[generate_terrain(seed, x, y)[0]]
+            index += 1
+    return bytes(codes)
+
+class WorldMap:
+    def __init__(self, seed=None):
+        self.map = ChunkedTileStore()
         self.town_types = {}
         self.town_names = {}
         self.mineshafts = set()
         self.town_layouts = {}
         self.looted_houses = set()
         self.forest_wood = defaultdict(lambda: 20)
-        self.seed = random.randint(0, 1000000)
+        self._seed = random.randint(0, 1000000) if seed is None else seed
         self.fort_inventories = {}  # Store weapon inventories for each fort
+        self.tile_overrides = {}  # Player changes to generated terrain, e.g. depleted forests
+        self.poi_index = PointIndex()  # Towns, temples, mineshafts, strongholds and forts
+        self.modified_forts = set()  # Forts whose stock differs from the generated one
+        self.tile_listeners = []  # Called as listener(x, y, terrain) for each new or changed tile
         self.generate_initial_area()
         self.npc_names = {}
 
+    @property
+    def seed(self):
+        """Fixed at construction: the tiles generated so far, the ocean masks and fort
+        stock all derive from it, so loading a save builds a new WorldMap with its seed"""
+        return self._seed
+
     def get_fort_inventory(self, x, y):
         if (x, y) not in self.fort_inventories:
-            self.fort_inventories[(x, y)] = generate_fort_inventory()
+            rng = random.Random(tile_hash(self.seed, x, y, FORT_INVENTORY))
+            self.fort_inventories[(x, y)] = generate_fort_inventory(rng)
         return self.fort_inventories[(x, y)]
 
-    def get_town_name(self, x, y):
+    def get_town_name(self, x, y, rng=random):
         if (x, y) not in self.town_names:
             town_type = self.town_types.get((x, y))
             if town_type:
-                self.town_names[(x, y)] = generate_town_name(town_type)
+                self.town_names[(x, y)] = generate_town_name(town_type, rng)
         return self.town_names.get((x, y), "Unknown Town")
 
-    def get_npc_name(self, x, y, profession):
+    def get_npc_name(self, x, y, profession, rng=random):
         key = (x, y, profession)
         if key not in self.npc_names:
-            self.npc_names[key] = generate_npc_name(profession)
+            self.npc_names[key] = generate_npc_name(profession, rng)
         return self.npc_names[key]
 
     def get_forest_color(self, x, y):
@@ -283,86 +627,138 @@ class WorldMap:
     def deplete_forest(self, x, y, amount):
         self.forest_wood[(x, y)] = max(0, self.forest_wood[(x, y)] - amount)
         if self.forest_wood[(x, y)] <= 0:
-            self.map[y][x] = 'P'
+            self.set_terrain(x, y, 'P')
             return True
         return False
 
-    def is_ocean(self, x, y):
-        scale = 15.0
-        octaves = 1
-        persistence = 0.5
-        lacunarity = 2.0
-        value = noise.pnoise2(x/scale, 
-                            y/scale, 
-                            octaves=octaves, 
-                            persistence=persistence,
-                            lacunarity=lacunarity,
-                            repeatx=1000,
-                            repeaty=1000,
-                            base=self.seed)
-        return value < -0.1
+    def set_terrain(self, x, y, terrain):
+        """Change a tile in a way that has to survive save/load"""
+        old_kind = POI_KINDS.get(self.map.get(x, y))
+        if old_kind:
+            self.poi_index.remove(old_kind, x, y)
+        self.map.set(x, y, terrain)
+        self.tile_overrides[(x, y)] = terrain
+        self.register_feature(x, y, terrain)
+        self.notify_tile(x, y, terrain)
 
-    def get_tile_type(self, x, y):
-        if not self.is_ocean(x, y):
-            return 'P'
+    def add_tile_listener(self, listener):
+        """Have listener(x, y, terrain) called for every tile generated or changed from now on"""
+        self.tile_listeners.append(listener)
 
-        has_land_neighbor = False
-        for dx, dy in [(0, 1), (0, -1), (1, 0), (-1, 0)]:
-            nx, ny = x + dx, y + dy
-            if not self.is_ocean(nx, ny):
-                has_land_neighbor = True
-                break
+    def remove_tile_listener(self, listener):
+        if listener in self.tile_listeners:
+            self.tile_listeners.remove(listener)
 
-        if has_land_neighbor:
-            return 'B'
+    def notify_tile(self, x, y, terrain):
+        for listener in self.tile_listeners:
+            listener(x, y, terrain)
 
-        for dx, dy in [(0, 1), (0, -1), (1, 0), (-1, 0)]:
-            nx, ny = x + dx, y + dy
-            if self.map[ny][nx] == 'B':
-                return 'C'
+    def nearest(self, kind, x, y, max_radius=None):
+        """Nearest generated 'town', 'temple', 'mineshaft', 'stronghold' or 'fort'"""
+        return self.poi_index.nearest(kind, x, y, max_radius)
+
+    def within(self, kind, bbox):
+        """Generated points of interest of a kind inside (x0, y0, x1, y1), inclusive"""
+        return self.poi_index.within(kind, bbox)
 
-        return 'O'
+    def mark_fort_modified(self, x, y):
+        self.modified_forts.add((x, y))
+
+    def get_ocean_mask(self, cx, cy):
+        return cached_ocean_mask(cx, cy, self.seed)
+
+    def ocean_cache_info(self):
+        """Hit/miss counters and size of the shared ocean mask cache"""
+        return cached_ocean_mask.cache_info()
+
+    def is_ocean(self, x, y):
+        cx, cy = x // CHUNK_SIZE, y // CHUNK_SIZE
+        return self.get_ocean_mask(cx, cy)[ocean_mask_index(x - cx * CHUNK_SIZE, y - cy * CHUNK_SIZE)] == 1
+
+    def get_tile_type(self, x, y):
+        return water_tile_type(self.seed, x, y)
 
     def ensure_terrain_exists(self, x, y):
-        if not self.map[y][x]:
-            tile_type = self.get_tile_type(x, y)
-
-            # Handle water-related tiles first
-            if tile_type in ['O', 'B', 'C']:
-                self.map[y][x] = tile_type
-                return self.map[y][x]
-
-            # Handle land-based features
-            roll = random.random()
-            if roll < 0.1:  # 10% chance for town
-                self.map[y][x] = 'T'
-                self.town_types[(x, y)] = choice(['small', 'medium', 'large'])
-            elif roll < 0.15:  # 5% chance for temple
-                self.map[y][x] = 'X'
-            elif roll < 0.17:  # 2% chance for mineshaft
-                self.map[y][x] = 'M'
-                self.mineshafts.add((x, y))
-            elif roll < 0.20:  # 3% chance for stronghold
-                tier = random.randint(1, 3)
-                self.map[y][x] = f'S{tier}'  # S1, S2, or S3 for different tiers
-            elif roll < 0.30:  # 10% chance for forest
-                self.map[y][x] = 'F'
-                self.forest_wood[(x, y)] = 20
-                # Create forest cluster
-                for dx, dy in [(0,1), (1,0), (0,-1), (-1,0)]:
-                    if random.random() < 0.7:  # 70% chance to spread
-                        nx, ny = x + dx, y + dy
-                        if not self.map[ny][nx]:  # Only if tile is empty
-                            self.map[ny][nx] = 'F'
-                            self.forest_wood[(nx, ny)] = 20
-            elif roll < 0.32: #2% chance for fort
-                self.map[y][x] = 'F_F'
-                # Generate fort inventory when creating the fort
-                self.get_fort_inventory(x, y)
-            else:
-                self.map[y][x] = tile_type
+        terrain = self.map.get(x, y)
+        if terrain:
+            return terrain
+
+        terrain, town_type = generate_terrain(self.seed, x, y)
+        self.map.set(x, y, terrain)
+        self.register_feature(x, y, terrain, town_type)
+        self.notify_tile(x, y, terrain)
+        return terrain
+
+    def merge_chunk(self, cx, cy, codes):
+        """Install tiles from generate_chunk, keeping any tile that already exists"""
+        base_x = cx * CHUNK_SIZE
+        base_y = cy * CHUNK_SIZE
+        chunk = self.map.get_chunk(cx, cy)
+        if chunk is None:
+            # Fresh chunk: adopt the codes wholesale and only visit feature tiles
+            chunk = self.map.chunks[(cx, cy)] = TileChunk()
+            chunk.tiles[:] = codes
+            chunk.count = CHUNK_SIZE * CHUNK_SIZE - codes.count(0)
+            for index, code in enumerate(codes):
+                if code in FEATURE_CODES:
+                    x = base_x + index % CHUNK_SIZE
+                    y = base_y + index // CHUNK_SIZE
+                    self.register_feature(x, y, TILE_PALETTE[code])
+            if self.tile_listeners:
+                for index, code in enumerate(codes):
+                    if code:
+                        self.notify_tile(base_x + index % CHUNK_SIZE, base_y + index // CHUNK_SIZE,
+                                         TILE_PALETTE[code])
+            return
+
+        for index, code in enumerate(codes):
+            if chunk.tiles[index]:
+                continue
+            x = base_x + index % CHUNK_SIZE
+            y = base_y + index // CHUNK_SIZE
+            terrain = TILE_PALETTE[code]
+            self.map.set(x, y, terrain)
+            self.register_feature(x, y, terrain)
+            self.notify_tile(x, y, terrain)
+
+    def register_feature(self, x, y, terrain, town_type=None):
+        """Record the bookkeeping that goes with a newly generated tile"""
+        if terrain == 'T':
+            if town_type is None:
+                town_type = roll_land_feature(self.seed, x, y)[1]
+            self.town_types[(x, y)] = town_type
+        elif terrain == 'M':
+            self.mineshafts.add((x, y))
+        kind = POI_KINDS.get(terrain)
+        if kind:
+            self.poi_index.add(kind, x, y)
+        # Forests start with the forest_wood default and fort stock is rolled
+        # deterministically on first visit, so neither needs recording here
+
+    def generate_region(self, x0, y0, x1, y1, workers=1, merge=True):
+        """Generate every chunk overlapping x0 <= x < x1, y0 <= y < y1.
+
+        With workers > 1 the chunks are generated in a process pool (call from
+        under an ``if __name__ == "__main__"`` guard on spawn-based platforms).
+        Output is identical for any worker count. Returns {(cx, cy): tile codes}.
+        """
+        keys = [(cx, cy)
+                for cy in range(y0 // CHUNK_SIZE, (y1 - 1) // CHUNK_SIZE + 1)
+                for cx in range(x0 // CHUNK_SIZE, (x1 - 1) // CHUNK_SIZE + 1)]
+        cxs = [cx for cx, _ in keys]
+        cys = [cy for _, cy in keys]
+        if workers > 1 and len(keys) > 1:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                batch = max(1, len(keys) // (workers * 4))
+                results = list(pool.map(generate_chunk, repeat(self.seed), cxs, cys, chunksize=batch))
+        else:
+            results = [generate_chunk(self.seed, cx, cy) for cx, cy in keys]
 
-        return self.map[y][x]
+        chunks = dict(zip(keys, results))
+        if merge:
+            for (cx, cy), codes in chunks.items():
+                self.merge_chunk(cx, cy, codes)
+        return chunks
 
     def get_terrain(self, x, y):
         return self.ensure_terrain_exists(x, y)
@@ -392,45 +788,106 @@ class WorldMap:
         return terrain != 'O'
 
     def to_dict(self):
+        return self.to_delta_dict()
+
+    def to_delta_dict(self):
+        """Save only what generation from the seed can't reproduce"""
         return {
-            'map': {str(y): {str(x): tile for x, tile in row.items()} for y, row in self.map.items()},
-            'town_types': self.town_types,
-            'town_names': self.town_names,
-            'mineshafts': list(self.mineshafts),
-            'town_layouts': self.town_layouts,
-            'looted_houses': list(self.looted_houses),
-            'forest_wood': {f"{x},{y}": amount for (x, y), amount in self.forest_wood.items()},
-            'npc_names': self.npc_names,
+            'format': 'delta',
+            'generator': WORLD_GENERATOR_VERSION,
             'seed': self.seed,
-            'fort_inventories': {f"{x},{y}": [w.to_dict() for w in weapons] 
-                                for (x, y), weapons in self.fort_inventories.items()}
+            'tile_overrides': {f"{x},{y}": tile for (x, y), tile in self.tile_overrides.items()},
+            'forest_wood': {f"{x},{y}": amount for (x, y), amount in self.forest_wood.items()
+                            if amount != 20},
+            'looted_houses': [list(house) for house in self.looted_houses],
+            'town_layouts': {f"{x},{y}": {'map': [''.join(row) for row in town_map],
+                                          'lights': [[hx, hy, lit] for (hx, hy), lit in house_lights.items()]}
+                             for (x, y), (town_map, house_lights) in self.town_layouts.items()},
+            'town_names': {f"{x},{y}": name for (x, y), name in self.town_names.items()},
+            'npc_names': {f"{x},{y},{profession}": name
+                          for (x, y, profession), name in self.npc_names.items()},
+            'fort_inventories': {f"{x},{y}": [w.to_dict() for w in self.fort_inventories[(x, y)]]
+                                 for (x, y) in self.modified_forts}
         }
 
     @classmethod
     def from_dict(cls, data):
-        world_map = cls()
-        world_map.seed = data['seed']
-        for y, row in data['map'].items():
-            for x, tile in row.items():
-                world_map.map[int(y)][int(x)] = tile
-        world_map.town_types = data['town_types']
-        world_map.town_names = data.get('town_names', {})
-        world_map.mineshafts = set(data['mineshafts'])
-        world_map.town_layouts = data['town_layouts']
-        world_map.looted_houses = set(data['looted_houses'])
+        if data.get('format') == 'delta':
+            return cls.from_delta_dict(data)
+        return cls.from_legacy_dict(data)
+
+    @classmethod
+    def from_legacy_dict(cls, data):
+        """Load a save from before delta saves, which stored every explored tile.
+
+        Tiles that differ from what the seed generates are recorded as
+        overrides, so the next (delta) save keeps them.
+        """
+        world_map = cls(seed=data['seed'])
+        for row_y, row in data['map'].items():
+            for row_x, tile in row.items():
+                if not tile:
+                    continue
+                x, y = int(row_x), int(row_y)
+                if tile != generate_terrain(world_map.seed, x, y)[0]:
+                    world_map.set_terrain(x, y, tile)
+                else:
+                    world_map.map.set(x, y, tile)
+                    world_map.register_feature(x, y, tile)
+        # Town types and mineshafts were filled in by register_feature
+        world_map.mineshafts |= {tuple(shaft) for shaft in data['mineshafts']}
+        world_map.looted_houses = {tuple(house) for house in data['looted_houses']}
         world_map.forest_wood = defaultdict(lambda: 20)
         for coord, amount in data.get('forest_wood', {}).items():
             x, y = map(int, coord.split(','))
             world_map.forest_wood[(x, y)] = amount
-        world_map.npc_names = data.get('npc_names', {})
+        world_map.load_towns(data)
+
+        # Every stored fort is kept; the old format didn't say which ones changed
+        for coord, weapons_data in data.get('fort_inventories', {}).items():
+            x, y = map(int, coord.split(','))
+            world_map.fort_inventories[(x, y)] = [Weapon.from_dict(w) for w in weapons_data]
+            world_map.modified_forts.add((x, y))
+
+        return world_map
+
+    @classmethod
+    def from_delta_dict(cls, data):
+        """Rebuild a world from a delta save; untouched tiles regenerate lazily from the seed"""
+        world_map = cls(seed=data['seed'])
+
+        for coord, tile in data.get('tile_overrides', {}).items():
+            x, y = map(int, coord.split(','))
+            world_map.set_terrain(x, y, tile)
+        for coord, amount in data.get('forest_wood', {}).items():
+            x, y = map(int, coord.split(','))
+            world_map.forest_wood[(x, y)] = amount
+        world_map.looted_houses = {tuple(house) for house in data.get('looted_houses', [])}
+
+        world_map.load_towns(data)
 
-        # Load fort inventories
         for coord, weapons_data in data.get('fort_inventories', {}).items():
             x, y = map(int, coord.split(','))
             world_map.fort_inventories[(x, y)] = [Weapon.from_dict(w) for w in weapons_data]
+            world_map.modified_forts.add((x, y))
 
         return world_map
 
+    def load_towns(self, data):
+        """Town layouts, town names and NPC names from a save, keyed by coordinate tuples again"""
+        for coord, layout in data.get('town_layouts', {}).items():
+            x, y = map(int, coord.split(','))
+            town_map = [list(row) for row in layout['map']]
+            house_lights = {(hx, hy): lit for hx, hy, lit in layout['lights']}
+            self.town_layouts[(x, y)] = (town_map, house_lights)
+
+        for coord, name in data.get('town_names', {}).items():
+            x, y = map(int, coord.split(','))
+            self.town_names[(x, y)] = name
+        for key, name in data.get('npc_names', {}).items():
+            x, y, profession = key.split(',', 2)
+            self.npc_names[(int(x), int(y), profession)] = name
+
     def get_stronghold_tier(self, x, y):
         terrain = self.get_terrain(x, y)
         if terrain.startswith('S'):
@@ -444,7 +901,57 @@ class WorldMap:
             surroundings.append(self.get_terrain(nx, ny))
         return surroundings
 
-def generate_town_name(size):
+# How far ahead of the player (in tiles) chunks are generated in the background
+PREFETCH_DISTANCE = CHUNK_SIZE // 2
+
+class ChunkPrefetcher:
+    """Generates chunks around and ahead of the player on a worker thread.
+
+    Finished chunks are only merged into the world by merge_ready(), which the
+    UI calls between frames, so WorldMap itself is never touched off-thread.
+    """
+
+    def __init__(self, workers=1):
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="chunk-prefetch")
+        self.pending = {}  # (seed, cx, cy) -> future
+
+    def prefetch(self, world, x, y, dx=0, dy=0):
+        ahead_x = (x + dx * PREFETCH_DISTANCE) // CHUNK_SIZE
+        ahead_y = (y + dy * PREFETCH_DISTANCE) // CHUNK_SIZE
+        targets = [(x // CHUNK_SIZE, y // CHUNK_SIZE)]
+        targets += [(ahead_x + ox, ahead_y + oy) for oy in (-1, 0, 1) for ox in (-1, 0, 1)]
+        for cx, cy in targets:
+            key = (world.seed, cx, cy)
+            if key not in self.pending and not world.map.is_chunk_complete(cx, cy):
+                self.pending[key] = self.executor.submit(generate_chunk, world.seed, cx, cy)
+
+    def merge_ready(self, world):
+        """Merge finished chunks into world; returns the number merged"""
+        merged = 0
+        for key, future in list(self.pending.items()):
+            if not future.done():
+                continue
+            del self.pending[key]
+            seed, cx, cy = key
+            # Chunks requested for a world that has since been replaced are dropped
+            if seed != world.seed:
+                continue
+            error = future.exception()
+            if error is not None:
+                # Not merged; ensure_terrain_exists generates the chunk when it's reached
+                print(f"Error generating chunk {cx},{cy}: {error}")
+                continue
+            world.merge_chunk(cx, cy, future.result())
+            merged += 1
+        return merged
+
+    def shutdown(self):
+        for future in self.pending.values():
+            future.cancel()
+        self.pending.clear()
+        self.executor.shutdown(wait=False)
+
+def generate_town_name(size, rng=random):
     prefixes = {
         'small': ['Little', 'Quiet', 'Peaceful', 'Hidden', 'Green', 'Sunny', 'Cozy', 'Meadow', 'Pine', 'Brook'],
         'medium': ['Silver', 'Golden', 'River', 'Lake', 'Forest', 'Market', 'Harbor', 'Mill', 'Bridge', 'Trade'],
@@ -455,9 +962,9 @@ def generate_town_name(size):
         'medium': ['port', 'town', 'market', 'bridge', 'mill', 'ford', 'haven', 'cross', 'field', 'wood'],
         'large': ['city', 'keep', 'castle', 'gate', 'spire', 'throne', 'realm', 'crown', 'shire', 'hold']
     }
-    return f"{choice(prefixes[size])} {choice(suffixes[size])}".title()
+    return f"{rng.choice(prefixes[size])} {rng.choice(suffixes[size])}".title()
 
-def generate_npc_name(profession):
+def generate_npc_name(profession, rng=random):
     first_names = [
         'John', 'William', 'Thomas', 'Henry', 'Edward', 'Arthur', 'Mary', 'Elizabeth', 'Anne', 'Margaret',
         'James', 'Robert', 'George', 'Charles', 'Richard', 'Emma', 'Sarah', 'Catherine', 'Alice', 'Jane'
@@ -471,15 +978,17 @@ def generate_npc_name(profession):
         'chef': ['Pan', 'Cook', 'Spice', 'Kitchen', 'Salt', 'Pepper', 'Sage', 'Thyme', 'Baker', 'Brew']
     }
     titles = profession_titles.get(profession, [''])
-    name_type = random.choice(['profession', 'location'])
+    name_type = rng.choice(['profession', 'location'])
     if name_type == 'profession' and profession in profession_titles:
-        last_name = f"{choice(titles)}{'smith' if 'smith' in profession else 'son'}"
+        last_name = f"{rng.choice(titles)}{'smith' if 'smith' in profession else 'son'}"
     else:
-        last_name = f"{choice(titles)}{'worth' if random.random() < 0.5 else 'ton'}"
-    return f"{choice(first_names)} {last_name}"
+        last_name = f"{rng.choice(titles)}{'worth' if rng.random() < 0.5 else 'ton'}"
+    return f"{rng.choice(first_names)} {last_name}"
 
 class GameState:
-    def __init__(self):
+    def __init__(self, seed=None, rng=None):
+        # Random stream for everything the player's actions roll; seed it to replay a game
+        self.rng = rng if rng is not None else random.Random()
         self.items = {
             "iron": "mine for it underground.",
             "chicken meat": "hunt chickens in the plains.",
@@ -567,7 +1076,7 @@ class GameState:
             "bullets": 100
         }
         self.coins = 0
-        self.world = WorldMap()
+        self.world = WorldMap(seed=seed)
         self.player_x = 0
         self.player_y = 0
 
@@ -577,7 +1086,8 @@ class GameState:
         self.default_hunting_weapon = Weapon(
             name="Old Revolver", 
             weapon_type=WeaponType.HUNTING, 
-            tier=1
+            tier=1,
+            rng=self.rng
         )
         self.weapons[self.default_hunting_weapon.id] = self.default_hunting_weapon
 
@@ -585,7 +1095,8 @@ class GameState:
         self.default_combat_weapon = Weapon(
             name="Rusty Sword", 
             weapon_type=WeaponType.COMBAT, 
-            tier=1
+            tier=1,
+            rng=self.rng
         )
         self.weapons[self.default_combat_weapon.id] = self.default_combat_weapon
 
@@ -702,8 +1213,9 @@ class GameState:
                     # Remove from fort inventory
                     fort_inventory.remove(weapon)
                     # Generate a new weapon of the same tier to replace it
-                    new_weapon = Weapon(tier=weapon.tier, weapon_type=WeaponType.COMBAT)
+                    new_weapon = Weapon(tier=weapon.tier, weapon_type=WeaponType.COMBAT, rng=self.rng)
                     fort_inventory.append(new_weapon)
+                    self.world.mark_fort_modified(x, y)
 
                     # Auto-equip if it's better than current or if we don't have a current weapon
                     current_weapon = self.get_current_weapon("combat")
@@ -826,30 +1338,30 @@ class GameState:
         base_description = ""
         if terrain == 'T':
             town_type = self.world.get_town_type(self.player_x, self.player_y)
-            town_name = self.world.get_town_name(self.player_x, self.player_y)
+            town_name = self.world.get_town_name(self.player_x, self.player_y, self.rng)
             base_description = f"Welcome to {town_name}, "
-            base_description += random.choice(terrain_descriptions[terrain][town_type])
+            base_description += self.rng.choice(terrain_descriptions[terrain][town_type])
         elif terrain == 'O':
             if 'boat' in self.inventory:
-                base_description = random.choice([
+                base_description = self.rng.choice([
                     "Your boat glides through the deep ocean waters",
                     "Waves gently rock your vessel as you sail",
                     "The vast sea stretches endlessly around your boat",
                     "Your boat cuts through the rolling waves"
                 ])
             else:
-                base_description = random.choice([
+                base_description = self.rng.choice([
                     "The deep ocean lies before you, but you'll need a boat to traverse it",
                     "These waters are too deep to swim. A boat would be necessary",
                     "Only a sturdy boat could take you across these waters",
                     "The ocean beckons, but you need a boat to venture forth"
                 ])
         elif terrain.startswith('S'):
-            base_description = random.choice(terrain_descriptions[terrain])
+            base_description = self.rng.choice(terrain_descriptions[terrain])
         elif terrain == 'F_F':
-            base_description = random.choice(terrain_descriptions[terrain])
+            base_description = self.rng.choice(terrain_descriptions[terrain])
         else:
-            base_description = random.choice(terrain_descriptions[terrain])
+            base_description = self.rng.choice(terrain_descriptions[terrain])
 
         if terrain == 'F':
             wood_left = self.world.forest_wood[(self.player_x, self.player_y)]
@@ -915,6 +1427,10 @@ class GameState:
             self.inventory[item] = count
         return f"You got {count} {item}."
 
+    def add_mineshaft(self):
+        """Turn the dig site the player is standing on into a mineshaft"""
+        self.world.set_terrain(self.player_x, self.player_y, 'M')
+
     def count_inventory_item(self, item):
         return self.inventory.get(item, 0)
 
@@ -924,7 +1440,7 @@ class GameState:
 
     def attempt_house_entry(self, lights_on=True, town_type='small'):
         if lights_on:
-            if randint(0, 1) == 1:
+            if self.rng.randint(0, 1) == 1:
                 self.coins = 0
                 return False, "You were caught! The guards confiscated all your coins."
             return True, "The house is occupied. Better leave before someone notices."
@@ -944,13 +1460,13 @@ class GameState:
                 'diamond': 0.02
             }
 
-            if randint(0, 1) == 1:
-                if random.random() < town_probabilities[town_type]['items']:
-                    item = random.choices(
+            if self.rng.randint(0, 1) == 1:
+                if self.rng.random() < town_probabilities[town_type]['items']:
+                    item = self.rng.choices(
                         list(possible_items.keys()),
                         weights=list(possible_items.values())
                     )[0]
-                    amount = randint(1, 2)
+                    amount = self.rng.randint(1, 2)
                     self.add_inventory_item(item, amount)
                     return True, f"You snuck in and found {amount} {item}!"
                 else:
@@ -959,7 +1475,7 @@ class GameState:
                         'medium': (20, 50),
                         'large': (40, 100)
                     }[town_type]
-                    coins_found = randint(base_amount[0], base_amount[1])
+                    coins_found = self.rng.randint(base_amount[0], base_amount[1])
                     self.coins += coins_found
                     return True, f"You snuck in and found {coins_found} coins!"
             return True, "The house is empty, and you found nothing of value."
@@ -1089,7 +1605,7 @@ class GameState:
         if terrain != 'F':
             return False, "You can only cut trees in the forest!"
 
-        wood_amount = random.randint(1, 5)
+        wood_amount = self.rng.randint(1, 5)
         current_wood = self.world.forest_wood[(self.player_x, self.player_y)]
 
         if current_wood <= 0:
@@ -0,0 +1,200 @@
+"""
+Array-backed hunting herd for very crowded hunts.
+
+Herd keeps every animal's state in parallel NumPy arrays and moves them all
+at once with the same rules as Animal.move: wandering with random turns,
+bouncing off the grazing area, and fleeing to the nearest edge once hit or
+scared. It uses its own random stream, so a herd doesn't replay the same
+hunt as the Animal objects of a HuntingEngine with the same seed.
+
+HuntingEngine doesn't use it: a hunt has a handful of animals, few enough
+that per-object updates are cheaper than array operations, and recorded
+hunts replay through Animal. Herd is for crowds of hundreds or more, such
+as stress tests and the benchmarks:
+
+    herd = Herd(seed=1)
+    herd.extend([AnimalType.DEER] * 500, xs, ys)
+    herd.add(AnimalType.BEAR, 200, 200)
+    herd.step()
+    herd.remove(herd.at_edge())
+
+NumPy is optional for the game; creating a Herd without it raises ImportError.
+"""
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from minigame_engines import AnimalType, ANIMAL_TRAITS, HUNT_FIELD_SIZE
+
+ANIMAL_TYPES = list(AnimalType)
+# Grazing area animals bounce inside until they flee: left, right, top, bottom
+BOUNDARY = (100, 300, 100, 300)
+EDGE_MARGIN = 5
+# Speed multiplier once hit, by type (Animal.handle_hit)
+HIT_SPEED_MULTIPLIER = {AnimalType.BEAR: 2, AnimalType.DEER: 1.5}
+
+
+class Herd:
+    FIELDS = ('type', 'x', 'y', 'prev_x', 'prev_y', 'heading_x', 'heading_y', 'base_speed', 'speed',
+              'multiplier', 'turn_odds', 'health', 'fleeing', 'target_x', 'target_y', 'facing')
+
+    def __init__(self, seed=None):
+        if np is None:
+            raise ImportError("Herd needs NumPy")
+        self.rng = np.random.default_rng(seed)
+        self.type = np.zeros(0, dtype=np.int8)  # Index into ANIMAL_TYPES
+        self.x = np.zeros(0)
+        self.y = np.zeros(0)
+        self.prev_x = np.zeros(0)
+        self.prev_y = np.zeros(0)
+        # Unit vector of the heading while wandering; kept instead of the angle so
+        # only animals that turn need cos/sin
+        self.heading_x = np.zeros(0)
+        self.heading_y = np.zeros(0)
+        self.base_speed = np.zeros(0)
+        self.speed = np.zeros(0)
+        self.multiplier = np.zeros(0)  # Wandering speed multiplier (birds fly faster)
+        self.turn_odds = np.zeros(0)  # Chance per step of picking a new heading
+        self.health = np.zeros(0, dtype=np.int32)
+        self.fleeing = np.zeros(0, dtype=bool)
+        self.target_x = np.zeros(0)  # Edge point a fleeing animal runs to
+        self.target_y = np.zeros(0)
+        self.facing = np.ones(0, dtype=np.int8)  # 1 right, -1 left
+
+        # Per-type constants, looked up by self.type
+        self.type_hit_multiplier = np.array([HIT_SPEED_MULTIPLIER.get(t, 1) for t in ANIMAL_TYPES])
+        self.type_hitbox = np.array([ANIMAL_TRAITS[t][3] for t in ANIMAL_TYPES])
+
+    def __len__(self):
+        return len(self.x)
+
+    def add(self, animal_type, x, y, angle=None):
+        """Add one animal; its heading is random unless given. Use extend() for many"""
+        self.extend([animal_type], [x], [y], None if angle is None else [angle])
+
+    def extend(self, animal_types, xs, ys, angles=None):
+        """Add one animal per entry of animal_types, growing each column once"""
+        count = len(animal_types)
+        if angles is None:
+            angles = np.radians(self.rng.integers(0, 361, size=count))
+        angles = np.asarray(angles, dtype=float)
+        traits = [ANIMAL_TRAITS[animal_type] for animal_type in animal_types]
+        speed = np.array([animal_type.value["speed"] for animal_type in animal_types], dtype=float)
+        rows = {
+            'type': [ANIMAL_TYPES.index(animal_type) for animal_type in animal_types],
+            'x': xs, 'y': ys, 'prev_x': xs, 'prev_y': ys,
+            'heading_x': np.cos(angles), 'heading_y': np.sin(angles),
+            'base_speed': speed, 'speed': speed,
+            'multiplier': [multiplier for _, _, multiplier, _ in traits],
+            # Animal.move turns when randint(0, turn chance) is 0
+            'turn_odds': [1 / (turn_chance + 1) for _, turn_chance, _, _ in traits],
+            'health': [animal_type.value["health"] for animal_type in animal_types],
+            'fleeing': np.zeros(count, dtype=bool),
+            'target_x': np.zeros(count), 'target_y': np.zeros(count),
+            'facing': np.ones(count)
+        }
+        for field in self.FIELDS:
+            array = getattr(self, field)
+            setattr(self, field, np.concatenate([array, np.asarray(rows[field], dtype=array.dtype)]))
+
+    @classmethod
+    def from_animals(cls, animals, seed=None):
+        """Herd holding the current state of a list of minigame_engines.Animal"""
+        herd = cls(seed)
+        herd.extend([animal.type for animal in animals], [animal.x for animal in animals],
+                    [animal.y for animal in animals], [animal.movement_angle for animal in animals])
+        for field, values in (
+                ('prev_x', [animal.prev_x for animal in animals]),
+                ('prev_y', [animal.prev_y for animal in animals]),
+                ('speed', [animal.current_speed for animal in animals]),
+                ('health', [animal.health for animal in animals]),
+                ('fleeing', [animal.is_fleeing for animal in animals]),
+                ('target_x', [animal.flee_target[0] for animal in animals]),
+                ('target_y', [animal.flee_target[1] for animal in animals]),
+                ('facing', [-1 if animal.current_image == 'left' else 1 for animal in animals])):
+            array = getattr(herd, field)
+            array[:] = np.asarray(values, dtype=array.dtype)
+        return herd
+
+    def remove(self, mask):
+        """Drop the animals where mask is True"""
+        keep = ~mask
+        for field in self.FIELDS:
+            setattr(self, field, getattr(self, field)[keep])
+
+    def at_edge(self):
+        return ((self.x <= EDGE_MARGIN) | (self.x >= HUNT_FIELD_SIZE - EDGE_MARGIN) |
+                (self.y <= EDGE_MARGIN) | (self.y >= HUNT_FIELD_SIZE - EDGE_MARGIN))
+
+    def flee(self, indices):
+        """Send the animals at indices running to their nearest edge"""
+        x = self.x[indices]
+        y = self.y[indices]
+        # Same order as Animal.get_nearest_edge, so ties pick the same edge
+        distances = np.stack([x, HUNT_FIELD_SIZE - x, y, HUNT_FIELD_SIZE - y])
+        edge = distances.argmin(axis=0)
+        self.target_x[indices] = np.choose(edge, [0, HUNT_FIELD_SIZE, x, x])
+        self.target_y[indices] = np.choose(edge, [y, y, 0, HUNT_FIELD_SIZE])
+        self.fleeing[indices] = True
+
+    def hit(self, indices, damage):
+        indices = np.asarray(indices, dtype=np.intp)
+        self.health[indices] -= damage
+        self.speed[indices] = self.base_speed[indices] * self.type_hit_multiplier[self.type[indices]]
+        self.flee(indices)
+
+    def near(self, x, y):
+        """Indices of the animals a shot at (x, y) hits, and of those it only scares"""
+        distance = np.hypot(x - self.x, y - self.y)
+        hitbox = self.type_hitbox[self.type]
+        hits = distance < hitbox
+        return np.flatnonzero(hits), np.flatnonzero(~hits & (distance < hitbox * 2))
+
+    def step(self):
+        """Move every animal by one hunt step"""
+        self.prev_x = self.x
+        self.prev_y = self.y
+        alive = self.health > 0
+        fleeing = alive & self.fleeing
+        wandering = alive & ~self.fleeing
+
+        # Fleeing: straight to the target edge
+        to_x = self.target_x - self.x
+        to_y = self.target_y - self.y
+        distance = np.sqrt(to_x * to_x + to_y * to_y)
+        scale = np.divide(self.speed, distance, out=np.zeros(len(self)), where=fleeing & (distance > 0))
+        flee_dx = to_x * scale
+        flee_dy = to_y * scale
+
+        # Wandering: sometimes turn, then step unless that leaves the grazing area
+        turning = wandering & (self.rng.random(len(self)) < self.turn_odds)
+        if turning.any():
+            angle = np.radians(self.rng.integers(0, 361, size=int(turning.sum())))
+            self.heading_x[turning] = np.cos(angle)
+            self.heading_y[turning] = np.sin(angle)
+        step = self.speed * self.multiplier
+        wander_dx = self.heading_x * step
+        wander_dy = self.heading_y * step
+        new_x = self.x + wander_dx
+        new_y = self.y + wander_dy
+        left, right, top, bottom = BOUNDARY
+        out_x = wandering & ((new_x < left) | (new_x > right))
+        out_y = wandering & ~out_x & ((new_y < top) | (new_y > bottom))
+        # Reflect the heading: pi - angle flips x, -angle flips y
+        self.heading_x = np.where(out_x, -self.heading_x, self.heading_x)
+        self.heading_y = np.where(out_y, -self.heading_y, self.heading_y)
+        moving = wandering & ~out_x & ~out_y
+
+        # New arrays rather than in-place updates, so prev_x/prev_y keep the old positions
+        self.x = np.clip(np.where(moving, new_x, self.x + flee_dx), 0, HUNT_FIELD_SIZE)
+        self.y = np.clip(np.where(moving, new_y, self.y + flee_dy), 0, HUNT_FIELD_SIZE)
+        dx = np.where(wandering, wander_dx, flee_dx)
+        self.facing = np.where(dx > 0, 1, np.where(dx < 0, -1, self.facing)).astype(np.int8)
+
+    def image_key(self, index):
+        """'left', 'right' or 'dead', as Animal.image_key"""
+        if self.health[index] <= 0:
+            return 'dead'
+        return 'right' if self.facing[index] > 0 else 'left'
@@ -0,0 +1,159 @@
+"""
+Recording and replaying hunting sessions.
+
+A hunt is deterministic given its random seed, the hunter's starting kit and
+which actions happened after how many fixed steps, so that is all a
+recording holds, packed with struct into a few bytes per shot:
+
+    header  magic, version, seed, has rifle, bullets, duration
+    events  step, action (shoot / reload), x, y
+    end     step the hunt stopped at, score, digest of the final state
+
+Set ODYSSEY_RECORD_HUNTS=<directory> to record every hunt played in the
+game. Recordings replay without a display as fast as the engine runs, and
+the final state is checked against the recorded digest, so they can be
+compared bit-for-bit across versions or used to time the hunt:
+
+    python hunt_replay.py hunts/hunt-20260101-120000-42.hunt --repeat 20
+"""
+import argparse
+import hashlib
+import os
+import random
+import struct
+import time
+
+from game_logic import GameState
+from minigame_engines import HuntingEngine
+
+MAGIC = b'OHNT'
+VERSION = 1
+HEADER = struct.Struct('<4sBQ?IH')  # magic, version, seed, has rifle, bullets, duration
+EVENT = struct.Struct('<IBdd')  # step, action code, x, y
+RESULT = struct.Struct('<Ii16s')  # end step, score, state digest
+
+ACTION_CODES = {'shoot': 0, 'reload': 1}
+ACTION_NAMES = {code: name for name, code in ACTION_CODES.items()}
+END = 255  # Action code closing the event list
+
+
+class ReplayMismatch(Exception):
+    """A replay ended in a different state from the one recorded"""
+
+
+def recording_dir():
+    return os.environ.get("ODYSSEY_RECORD_HUNTS") or None
+
+def attach(seed, game_state, duration=60):
+    """A HuntRecorder if ODYSSEY_RECORD_HUNTS is set, otherwise None"""
+    if not recording_dir():
+        return None
+    return HuntRecorder(seed, game_state, duration)
+
+def state_digest(engine):
+    """Hash of everything a hunt's outcome is made of, floats included bit for bit"""
+    digest = hashlib.md5()
+    digest.update(struct.pack('<Iii', engine.steps, engine.score,
+                              engine.game_state.inventory.get('bullets', 0)))
+    for animal in engine.animals:
+        digest.update(animal.type.name.encode())
+        digest.update(struct.pack('<ddi?', animal.x, animal.y, animal.health, animal.is_fleeing))
+    return digest.digest()
+
+
+class HuntRecorder:
+    def __init__(self, seed, game_state, duration=60):
+        self.header = HEADER.pack(MAGIC, VERSION, seed, 'hunting_rifle' in game_state.inventory,
+                                  game_state.inventory.get('bullets', 0), duration)
+        self.seed = seed
+        self.events = bytearray()
+
+    def record(self, engine, action):
+        """Call with each action just before it is passed to engine.step()"""
+        name, *args = action
+        x, y = args if args else (0.0, 0.0)
+        self.events += EVENT.pack(engine.steps, ACTION_CODES[name], x, y)
+
+    def to_bytes(self, engine):
+        return (self.header + bytes(self.events) + EVENT.pack(engine.steps, END, 0.0, 0.0) +
+                RESULT.pack(engine.steps, engine.score, state_digest(engine)))
+
+    def save(self, engine, directory=None):
+        """Write the recording into directory (ODYSSEY_RECORD_HUNTS by default); returns the path"""
+        directory = directory or recording_dir()
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory, f"hunt-{time.strftime('%Y%m%d-%H%M%S')}-{self.seed}.hunt")
+        with open(path, 'wb') as f:
+            f.write(self.to_bytes(engine))
+        return path
+
+
+class Recording:
+    def __init__(self, data):
+        magic, version, self.seed, self.has_rifle, self.bullets, self.duration = HEADER.unpack_from(data)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError("Not a hunt recording, or one from an unsupported version")
+        self.events = []  # (step, action tuple)
+        offset = HEADER.size
+        while True:
+            step, code, x, y = EVENT.unpack_from(data, offset)
+            offset += EVENT.size
+            if code == END:
+                break
+            action = ('shoot', x, y) if code == ACTION_CODES['shoot'] else (ACTION_NAMES[code],)
+            self.events.append((step, action))
+        self.end_step, self.score, self.digest = RESULT.unpack_from(data, offset)
+
+    @classmethod
+    def load(cls, path):
+        with open(path, 'rb') as f:
+            return cls(f.read())
+
+def replay(recording, game_state=None, verify=True):
+    """Run a recorded hunt without a display; returns the finished engine.
+
+    game_state can be reused between replays, its inventory is reset to the
+    recorded kit. Raises ReplayMismatch if the outcome differs from the recording.
+    """
+    game_state = game_state or GameState()
+    game_state.inventory = {'bullets': recording.bullets}
+    if recording.has_rifle:
+        game_state.inventory['hunting_rifle'] = 1
+    engine = HuntingEngine(game_state, random.Random(recording.seed), duration=recording.duration)
+    for step, action in recording.events:
+        while engine.steps < step and not engine.finished:
+            engine.update()
+        engine.step(action)
+    while engine.steps < recording.end_step and not engine.finished:
+        engine.update()
+    if verify and (engine.score, state_digest(engine)) != (recording.score, recording.digest):
+        raise ReplayMismatch(f"Replay ended with score {engine.score} after {engine.steps} steps; "
+                             f"recorded score {recording.score} after {recording.end_step}")
+    return engine
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay recorded hunts and check they end the same way")
+    parser.add_argument('recordings', nargs='+')
+    parser.add_argument('--repeat', type=int, default=1, help="replays per recording, for timing")
+    args = parser.parse_args()
+
+    failed = False
+    for path in args.recordings:
+        recording = Recording.load(path)
+        game_state = GameState()
+        try:
+            start = time.perf_counter()
+            for _ in range(args.repeat):
+                engine = replay(recording, game_state)
+            seconds = (time.perf_counter() - start) / args.repeat
+        except ReplayMismatch as e:
+            print(f"{path}: MISMATCH {e}")
+            failed = True
+            continue
+        print(f"{path}: ok, score {engine.score}, {len(recording.events)} actions, "
+              f"{engine.steps} steps in {seconds * 1000:.1f} ms ({engine.steps / seconds:.0f} steps/s)")
+    if failed:
+        raise SystemExit(1)
+
+if __name__ == "__main__":
+    main()
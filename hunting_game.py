@@ -1,133 +1,14 @@
 import tkinter as tk
 from tkinter import ttk, messagebox
 import math
-from random import randint, choice
-from enum import Enum
+import random
 import time
-from PIL import Image, ImageTk
-
-class AnimalType(Enum):
-    CHICKEN = {"speed": 2, "value": 10, "health": 1, "pattern": "hop", "size": 25}
-    DEER = {"speed": 6, "value": 25, "health": 2, "pattern": "flee", "size": 50}
-    BEAR = {"speed": 2, "value": 50, "health": 3, "pattern": "graze", "size": 50}
-    BIRD = {"speed": 6, "value": 25, "health": 1, "pattern": "fly", "size": 35}
-
-class Animal:
-    def __init__(self, animal_type, x, y, images):
-        self.type = animal_type
-        self.x = x
-        self.y = y
-        self.health = animal_type.value["health"]
-        self.images = images
-        self.current_image = 'right'
-        self.original_speed = animal_type.value["speed"]
-        self.current_speed = self.original_speed
-        self.is_fleeing = False
-        
-        # Initialize flee_target to a safe default
-        self.flee_target = (0, 0)  # Will get a better value when needed
-        
-        self.movement_angle = math.radians(randint(0, 360))
-        self.boundary = {
-            'left': 100,
-            'right': 300,
-            'top': 100,
-            'bottom': 300
-        }
-
-    def get_nearest_edge(self):
-        distances = [
-            (0, self.y, self.x),
-            (400, self.y, 400 - self.x),
-            (self.x, 0, self.y),
-            (self.x, 400, 400 - self.y)
-        ]
-        closest = min(distances, key=lambda x: x[2])
-        return (closest[0], closest[1])
-
-    def handle_hit(self, damage):
-        self.health -= damage
-        if self.type == AnimalType.BEAR:
-            self.current_speed = self.original_speed * 2
-        elif self.type == AnimalType.DEER:
-            self.current_speed = self.original_speed * 1.5
-        self.is_fleeing = True
-        self.flee_target = self.get_nearest_edge()
-
-    def check_boundary(self, new_x, new_y):
-        if not self.is_fleeing:
-            if new_x < self.boundary['left'] or new_x > self.boundary['right']:
-                self.movement_angle = math.pi - self.movement_angle
-                return False
-            if new_y < self.boundary['top'] or new_y > self.boundary['bottom']:
-                self.movement_angle = -self.movement_angle
-                return False
-            return True
-        else:
-            return True
-
-    def move(self):
-        if self.health <= 0:
-            return
+from minigame_engines import AnimalType, HuntingEngine
+import loop_profiler
+import hunt_replay
+import sprites
 
-        # Initialize dx and dy default values
-        dx, dy = 0, 0
-
-        if self.is_fleeing:
-            # If flee_target isn't set, initialize it
-            if not hasattr(self, 'flee_target') or self.flee_target is None:
-                self.flee_target = self.get_nearest_edge()
-                
-            dx = self.flee_target[0] - self.x
-            dy = self.flee_target[1] - self.y
-            distance = math.hypot(dx, dy)
-            if distance > 0:
-                dx = dx / distance * self.current_speed
-                dy = dy / distance * self.current_speed
-                new_x = self.x + dx
-                new_y = self.y + dy
-                self.x = new_x
-                self.y = new_y
-        else:
-            if (self.type.value["pattern"] == "hop" and randint(0, 30) == 0) or \
-               (self.type.value["pattern"] == "fly" and randint(0, 10) == 0) or \
-               (self.type.value["pattern"] == "flee" and randint(0, 20) == 0) or \
-               (self.type.value["pattern"] == "graze" and randint(0, 40) == 0):
-                self.movement_angle = math.radians(randint(0, 360))
-
-            speed_multiplier = 1.5 if self.type.value["pattern"] == "fly" else 1.0
-            dx = math.cos(self.movement_angle) * self.current_speed * speed_multiplier
-            dy = math.sin(self.movement_angle) * self.current_speed * speed_multiplier
-
-            new_x = self.x + dx
-            new_y = self.y + dy
-
-            if self.check_boundary(new_x, new_y):
-                self.x = new_x
-                self.y = new_y
-
-        # Update image direction based on movement
-        if dx > 0:  # Moving right
-            self.current_image = 'right'
-        elif dx < 0:  # Moving left
-            self.current_image = 'left'
-        # If dx is 0, keep the current image direction
-
-        self.x = max(0, min(self.x, 400))
-        self.y = max(0, min(self.y, 400))
-
-    def is_at_edge(self):
-        margin = 5
-        return (self.x <= margin or self.x >= 400 - margin or 
-                self.y <= margin or self.y >= 400 - margin)
-
-    def get_current_image(self):
-        if self.health <= 0:
-            return self.images['dead']
-        return self.images[self.current_image]
-
-    def get_hitbox_size(self):
-        return self.type.value["size"] // 2
+RENDER_INTERVAL = 16  # ms between frames; the hunt itself runs on HUNT_STEP
 
 class HuntingGame(tk.Toplevel):
     def __init__(self, parent, game_state):
@@ -135,68 +16,24 @@ class HuntingGame(tk.Toplevel):
         self.title("Hunting Ground")
         self.game_state = game_state
 
-        # Add the images with proper error handling
+        # Images are decoded once per process and shared between hunts
         self.animal_images = {}
-        
-        # Define image paths and sizes
-        animal_image_config = {
-            AnimalType.CHICKEN: {
-                'size': (25, 25),
-                'paths': {
-                    'left': 'attached_assets/Chicken_Left.png',
-                    'right': 'attached_assets/Chicken_Right.png',
-                    'dead': 'attached_assets/Chicken_Dead.png'
-                }
-            },
-            AnimalType.DEER: {
-                'size': (50, 50),
-                'paths': {
-                    'left': 'attached_assets/Deer_Left.png',
-                    'right': 'attached_assets/Deer_Right.png',
-                    'dead': 'attached_assets/Deer_Dead.png'
-                }
-            },
-            AnimalType.BEAR: {
-                'size': (50, 50),
-                'paths': {
-                    'left': 'attached_assets/Bear_Left.png',
-                    'right': 'attached_assets/Bear_Right.png',
-                    'dead': 'attached_assets/Bear_Dead.png'
-                }
-            },
-            AnimalType.BIRD: {
-                'size': (35, 35),
-                'paths': {
-                    'left': 'attached_assets/Bird_Left.png',
-                    'right': 'attached_assets/Bird_Right.png',
-                    'dead': 'attached_assets/Bird_Dead.png'
-                }
-            }
-        }
-        
-        # Load all images with error handling
-        for animal_type, config in animal_image_config.items():
+        for animal_type in AnimalType:
             self.animal_images[animal_type] = {}
-            for position, path in config['paths'].items():
-                try:
-                    self.animal_images[animal_type][position] = ImageTk.PhotoImage(
-                        Image.open(path).resize(config['size'])
-                    )
-                except Exception as e:
-                    print(f"Error loading image {path}: {str(e)}")
-                    # Create a colored rectangle as fallback
-                    img = Image.new('RGB', config['size'], color=(255, 0, 0))
-                    self.animal_images[animal_type][position] = ImageTk.PhotoImage(img)
-
-        self.time_remaining = 60
-        self.score = 0
-        self.animals = []
-        self.start_time = time.time()
-        self.spawn_timer = 0
+            for pose in ('left', 'right', 'dead'):
+                name = f"{animal_type.name.capitalize()}_{pose.capitalize()}.png"
+                self.animal_images[animal_type][pose] = sprites.get_photo(self, name, sprites.SPRITE_SIZES[name])
+
+        # Seeded, so a recording of the hunt can be replayed exactly
+        seed = random.getrandbits(63)
+        self.engine = HuntingEngine(game_state, random.Random(seed))
+        self.recorder = hunt_replay.attach(seed, game_state, self.engine.duration)
+        self.last_frame_time = time.perf_counter()
+        self.next_frame_time = self.last_frame_time + RENDER_INTERVAL / 1000
 
         self.setup_ui()
-        self.spawn_animals(initial=True)
-        self.after(50, self.game_loop)
+        self.profiler = loop_profiler.attach("hunting", RENDER_INTERVAL, self.canvas)
+        self.after(RENDER_INTERVAL, self.game_loop)
         self.bind('<space>', self.shoot)
         self.bind('<Motion>', self.update_crosshair)
         self.bind('r', lambda e: self.reload_weapon())
@@ -217,9 +54,8 @@ class HuntingGame(tk.Toplevel):
         ttk.Label(info_frame, text="HUNTING", font=('Courier', 16, 'bold')).pack()
 
         # Simple hunting weapon display
-        has_rifle = 'hunting_rifle' in self.game_state.inventory
-        weapon_name = "Hunting Rifle" if has_rifle else "Revolver"
-        self.weapon_label = ttk.Label(info_frame, text=f"Weapon: {weapon_name}")
+        has_rifle = self.engine.has_rifle
+        self.weapon_label = ttk.Label(info_frame, text=f"Weapon: {self.engine.weapon_name}")
         self.weapon_label.pack(pady=5)
 
         self.cooldown_label = ttk.Label(info_frame, text="Ready")
@@ -254,100 +90,29 @@ class HuntingGame(tk.Toplevel):
         ttk.Label(info_frame, text=controls_text, justify=tk.LEFT).pack(pady=20)
 
         self.crosshair = self.canvas.create_line(0, 0, 0, 0, fill='red', width=2)
+        # animal -> [canvas item, image key it shows], kept while the animal is in the field
+        self.animal_items = {}
 
     def shoot(self, event):
-        current_time = time.time()
-        
-        # Simple weapon logic without complex weapon object
-        has_rifle = 'hunting_rifle' in self.game_state.inventory
-        
-        # Use cooldown based on weapon type
-        cooldown = 3.0 if has_rifle else 1.0
-        
-        if hasattr(self, 'last_shot_time') and current_time - self.last_shot_time < cooldown:
-            return
-            
-        # Check for bullets
-        if self.game_state.inventory.get('bullets', 0) <= 0:
-            self.cooldown_label.config(text="No bullets!")
-            return
-
-        # Track shot time
-        self.last_shot_time = current_time
-        
         x = self.winfo_pointerx() - self.canvas.winfo_rootx()
         y = self.winfo_pointery() - self.canvas.winfo_rooty()
-
-        # Set damage based on weapon type
-        damage = 2 if has_rifle else 1
-        
-        # Use a bullet
-        if 'bullets' in self.game_state.inventory:
-            self.game_state.inventory['bullets'] -= 1
-            if self.game_state.inventory['bullets'] <= 0:
-                del self.game_state.inventory['bullets']
-        
+        if self.recorder:
+            self.recorder.record(self.engine, ('shoot', x, y))
+        messages = self.engine.step(('shoot', x, y))
+        if "No bullets!" in messages:
+            self.cooldown_label.config(text="No bullets!")
         self.bullet_label.config(text=f"Bullets: {self.game_state.inventory.get('bullets', 0)}")
-
-        for animal in self.animals[:]:
-            distance = math.hypot(x - animal.x, y - animal.y)
-            if distance < animal.get_hitbox_size():
-                animal.handle_hit(damage)
-                if animal.health <= 0:
-                    self.score += animal.type.value["value"]
-                    self.score_label.config(text=f"Score: {self.score}")
-                    if animal.type == AnimalType.CHICKEN:
-                        self.game_state.add_inventory_item("chicken meat", 1)
-                    elif animal.type == AnimalType.DEER:
-                        self.game_state.add_inventory_item("venison", 2)
-                    elif animal.type == AnimalType.BEAR:
-                        self.game_state.add_inventory_item("bear meat", 3)
-                    elif animal.type == AnimalType.BIRD:
-                        self.game_state.add_inventory_item("bird meat", 1)
-            elif distance < animal.get_hitbox_size() * 2:
-                animal.is_fleeing = True
-                animal.flee_target = animal.get_nearest_edge()
+        self.score_label.config(text=f"Score: {self.engine.score}")
 
     def reload_weapon(self):
-        # Simple reload for rifle
-        if 'hunting_rifle' in self.game_state.inventory:
-            self.last_shot_time = 0  # Reset cooldown
+        if self.recorder:
+            self.recorder.record(self.engine, ('reload',))
+        if self.engine.step(('reload',)):
             self.cooldown_label.config(text="Reloaded!")
 
     def switch_weapon(self):
         # We're using a simplified weapon system, so just update the UI
-        has_rifle = 'hunting_rifle' in self.game_state.inventory
-        weapon_name = "Hunting Rifle" if has_rifle else "Revolver"
-        self.weapon_label.config(text=f"Weapon: {weapon_name}")
-
-    def spawn_animals(self, initial=False):
-        if initial:
-            for _ in range(2):
-                self.spawn_animal(AnimalType.CHICKEN)
-            for _ in range(2):
-                self.spawn_animal(AnimalType.DEER)
-            self.spawn_animal(AnimalType.BEAR)
-            for _ in range(2):
-                self.spawn_animal(AnimalType.BIRD)
-        else:
-            self.spawn_timer += 1
-            if self.spawn_timer >= 20:
-                self.spawn_timer = 0
-                if randint(0, 100) < 30:
-                    animal_type = choice(list(AnimalType))
-                    self.spawn_animal(animal_type)
-
-    def spawn_animal(self, animal_type):
-        center_x, center_y = 200, 200
-        spawn_radius = 100
-
-        angle = math.radians(randint(0, 360))
-        distance = randint(20, spawn_radius)
-
-        x = center_x + math.cos(angle) * distance
-        y = center_y + math.sin(angle) * distance
-
-        self.animals.append(Animal(animal_type, x, y, self.animal_images[animal_type]))
+        self.weapon_label.config(text=f"Weapon: {self.engine.weapon_name}")
 
     def update_crosshair(self, event):
         x, y = event.x, event.y
@@ -359,45 +124,66 @@ class HuntingGame(tk.Toplevel):
                          x, y - size,
                          x, y + size)
 
+    def draw_animals(self):
+        """Move each animal's canvas item, creating and deleting items only as animals come and go"""
+        alpha = self.engine.step_alpha
+        in_field = set()
+        for animal in self.engine.animals:
+            in_field.add(animal)
+            x, y = animal.interpolated_position(alpha)
+            key = animal.image_key()
+            entry = self.animal_items.get(animal)
+            if entry is None:
+                item = self.canvas.create_image(x, y, image=self.animal_images[animal.type][key],
+                                                tags="animal")
+                self.animal_items[animal] = [item, key]
+                continue
+            item, shown = entry
+            self.canvas.coords(item, x, y)
+            if key != shown:
+                self.canvas.itemconfig(item, image=self.animal_images[animal.type][key])
+                entry[1] = key
+        for animal in [a for a in self.animal_items if a not in in_field]:
+            self.canvas.delete(self.animal_items.pop(animal)[0])
+
     def game_loop(self):
-        current_time = time.time()
-        elapsed = int(current_time - self.start_time)
-        remaining = max(0, self.time_remaining - elapsed)
-        self.time_label.config(text=f"Time: {remaining}")
-
-        # Simple weapon cooldown system
-        if hasattr(self, 'last_shot_time'):
-            has_rifle = 'hunting_rifle' in self.game_state.inventory
-            cooldown = 3.0 if has_rifle else 1.0
-            time_since_shot = current_time - self.last_shot_time
-            
-            if time_since_shot < cooldown:
-                remaining_cooldown = cooldown - time_since_shot
-                self.cooldown_label.config(text=f"Cooldown: {remaining_cooldown:.1f}s")
-            else:
-                self.cooldown_label.config(text="Ready")
+        if self.profiler:
+            self.profiler.tick_started()
+        current_time = time.perf_counter()
+        self.engine.tick(current_time - self.last_frame_time)
+        self.last_frame_time = current_time
+
+        self.time_label.config(text=f"Time: {math.ceil(self.engine.time_remaining)}")
+        remaining_cooldown = self.engine.cooldown_remaining()
+        if remaining_cooldown > 0:
+            self.cooldown_label.config(text=f"Cooldown: {remaining_cooldown:.1f}s")
         else:
             self.cooldown_label.config(text="Ready")
 
-        self.spawn_animals()
-
-        self.canvas.delete("animal")
-        for animal in self.animals[:]:
-            animal.move()
-            if animal.is_at_edge():
-                self.animals.remove(animal)
-                continue
-            self.canvas.create_image(animal.x, animal.y, 
-                                   image=animal.get_current_image(), 
-                                   tags="animal")
+        # Nothing to see while minimised, but the hunt keeps running
+        if self.state() != 'iconic':
+            self.draw_animals()
 
-        if remaining <= 0:
-            messagebox.showinfo("Hunt Over", 
-                              f"Hunt finished!\nScore: {self.score}")
+        if self.engine.finished:
+            if self.profiler:
+                self.profiler.tick_finished()
+                self.profiler.close()
+            messagebox.showinfo("Hunt Over", self.engine.messages[-1])
             self.destroy()
             return
 
-        self.after(50, self.game_loop)
+        # Schedule against the previous deadline so frames don't drift later and later
+        self.next_frame_time = max(self.next_frame_time + RENDER_INTERVAL / 1000, current_time)
+        if self.profiler:
+            self.profiler.tick_finished(self.next_frame_time)
+        delay = self.next_frame_time - time.perf_counter()
+        self.after(max(0, int(delay * 1000)), self.game_loop)
+
+    def destroy(self):
+        if self.recorder:
+            print(f"Hunt recorded to {self.recorder.save(self.engine)}")
+            self.recorder = None
+        super().destroy()
 
     def leave_hunt(self):
         """Handle leaving the hunt early"""
@@ -408,14 +194,11 @@ class HuntingGame(tk.Toplevel):
 # Function to start the hunting game from the main game
 def start_hunting_game(parent, game_state):
     """Initialize and show the hunting game window"""
-    hunting_game = HuntingGame(parent, game_state)
-    
-    # Make sure we have bullets!
+    # Make sure we have bullets! Before the window opens, so a recording starts with them
     if game_state.inventory.get("bullets", 0) <= 0:
         game_state.add_inventory_item("bullets", 10)
-        hunting_game.bullet_label.config(text=f"Bullets: {game_state.inventory.get('bullets', 0)}")
-    
-    return hunting_game
+
+    return HuntingGame(parent, game_state)
 
 if __name__ == "__main__":
     # For testing the game standalone
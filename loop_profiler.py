@@ -0,0 +1,145 @@
+"""
+Frame-time profiling for the Tk game loops.
+
+Set ODYSSEY_PROFILE=1 to record, for every loop that reschedules itself with
+after(), how long each tick takes, how late it started compared with when it
+was scheduled, and how many items its canvas holds. Percentiles are drawn in
+an overlay in the corner of the canvas. With ODYSSEY_PROFILE_TRACE=<file> all
+ticks are also written on exit as a Chrome trace (open in chrome://tracing or
+https://ui.perfetto.dev).
+
+Loops hook in with:
+
+    self.profiler = loop_profiler.attach("hunting", 50, self.canvas)
+    ...
+    if self.profiler:
+        self.profiler.tick_started()
+    ...
+    if self.profiler:
+        self.profiler.tick_finished()
+    self.after(50, self.game_loop)
+
+attach() returns None while profiling is off, so the hooks cost nothing.
+"""
+import atexit
+import json
+import os
+import time
+from collections import deque
+
+MAX_SAMPLES = 10000  # Ticks kept per loop
+OVERLAY_EVERY = 10  # Ticks between overlay updates
+
+# Every profiler created in this process, for the trace dump
+PROFILERS = []
+
+
+def enabled():
+    return os.environ.get("ODYSSEY_PROFILE", "") not in ("", "0")
+
+def attach(name, interval_ms, canvas=None):
+    """A LoopProfiler for a loop rescheduled every interval_ms, or None if profiling is off"""
+    if not enabled():
+        return None
+    if not PROFILERS:
+        trace_path = os.environ.get("ODYSSEY_PROFILE_TRACE")
+        if trace_path:
+            atexit.register(dump_trace, trace_path)
+    profiler = LoopProfiler(name, interval_ms, canvas)
+    PROFILERS.append(profiler)
+    return profiler
+
+def percentile(values, fraction):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+class LoopProfiler:
+    def __init__(self, name, interval_ms, canvas=None):
+        self.name = name
+        self.interval = interval_ms / 1000
+        self.canvas = canvas
+        self.overlay_item = None
+        self.ticks = 0
+        self.started_at = None
+        self.expected_at = None  # When the next tick was asked to run
+        # (start, duration, lateness, canvas items) per tick, times in seconds
+        self.samples = deque(maxlen=MAX_SAMPLES)
+
+    def tick_started(self):
+        self.started_at = time.perf_counter()
+
+    def tick_finished(self, next_deadline=None):
+        """Record the tick; call right before the loop reschedules itself.
+
+        Loops that schedule against a deadline rather than interval_ms after
+        the tick finished pass that deadline (a time.perf_counter() value).
+        """
+        now = time.perf_counter()
+        lateness = 0.0 if self.expected_at is None else max(0.0, self.started_at - self.expected_at)
+        items = self.count_items()
+        self.samples.append((self.started_at, now - self.started_at, lateness, items))
+        self.expected_at = now + self.interval if next_deadline is None else next_deadline
+        self.ticks += 1
+        if self.canvas is not None and self.ticks % OVERLAY_EVERY == 0:
+            self.draw_overlay()
+
+    def count_items(self):
+        if self.canvas is None:
+            return 0
+        try:
+            items = len(self.canvas.find_all())
+        except Exception:
+            return 0  # Canvas already destroyed
+        return items - (self.overlay_item is not None)
+
+    def stats(self):
+        durations = [s[1] for s in self.samples]
+        lateness = [s[2] for s in self.samples]
+        stats = {'loop': self.name, 'ticks': self.ticks,
+                 'canvas_items_max': max((s[3] for s in self.samples), default=0)}
+        for label, values in (('tick_ms', durations), ('late_ms', lateness)):
+            for fraction in (0.5, 0.95, 0.99):
+                stats[f'{label}_p{int(fraction * 100)}'] = round(percentile(values, fraction) * 1000, 2)
+        return stats
+
+    def summary(self):
+        s = self.stats()
+        return (f"{self.name}: tick p50/p95/p99 {s['tick_ms_p50']}/{s['tick_ms_p95']}/{s['tick_ms_p99']} ms, "
+                f"late p95 {s['late_ms_p95']} ms, items {self.samples[-1][3] if self.samples else 0}")
+
+    def draw_overlay(self):
+        try:
+            if self.overlay_item is None:
+                self.overlay_item = self.canvas.create_text(4, 4, anchor='nw', fill='yellow',
+                                                            font=('Courier', 9), tags='profiler')
+            self.canvas.itemconfig(self.overlay_item, text=self.summary())
+            self.canvas.tag_raise(self.overlay_item)
+        except Exception:
+            self.canvas = None  # Window closed; keep the samples
+
+    def close(self):
+        """Call when the loop stops; prints the summary"""
+        self.canvas = None
+        print(self.summary())
+
+    def trace_events(self, pid=1, tid=1):
+        events = [{'name': 'thread_name', 'ph': 'M', 'pid': pid, 'tid': tid,
+                   'args': {'name': self.name}}]
+        for start, duration, lateness, items in self.samples:
+            events.append({
+                'name': self.name, 'ph': 'X', 'pid': pid, 'tid': tid,
+                'ts': start * 1e6, 'dur': duration * 1e6,
+                'args': {'late_ms': round(lateness * 1000, 3), 'canvas_items': items}
+            })
+        return events
+
+def dump_trace(path):
+    """Write every loop's ticks to path in Chrome trace event format"""
+    events = []
+    for tid, profiler in enumerate(PROFILERS, start=1):
+        events.extend(profiler.trace_events(tid=tid))
+    with open(path, 'w') as f:
+        json.dump({'traceEvents': events, 'summary': [p.stats() for p in PROFILERS]}, f)
+    print(f"Loop trace written to {path}")
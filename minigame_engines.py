@@ -0,0 +1,1046 @@
+"""
+Headless rules for the mini-games.
+
+Each engine is a state machine over a GameState: step(action) applies one
+player action such as ('move', 1, 0) and returns the messages it produced,
+tick(dt) advances real-time games by dt seconds. Nothing here touches Tk, so
+sessions can be run without a display (e.g. for balancing) and the windows in
+hunting_game.py, combat_game.py etc. only draw the engine state.
+"""
+import math
+import random
+from collections import deque
+from enum import Enum
+
+from dice import get_distribution, expected_hits_to_kill
+
+
+class MinigameEngine:
+    """Shared action dispatch and message log"""
+
+    actions = ()  # Names of the methods step() may call
+
+    def __init__(self, game_state, rng=None):
+        self.game_state = game_state
+        self.rng = rng or random.Random()
+        self.messages = []
+        self.finished = False
+        self.outcome = None  # Set when finished, e.g. 'victory' or 'caught'
+
+    def say(self, message):
+        self.messages.append(message)
+
+    def finish(self, outcome, message=None):
+        self.finished = True
+        self.outcome = outcome
+        if message:
+            self.say(message)
+
+    def step(self, action):
+        name, *args = action
+        if name not in self.actions:
+            raise ValueError(f"Unknown action {name!r} for {type(self).__name__}")
+        start = len(self.messages)
+        if not self.finished:
+            getattr(self, name)(*args)
+        return self.messages[start:]
+
+    def tick(self, dt):
+        """Advance the game clock; turn-based games have nothing to do"""
+        return []
+
+
+# Hunting
+
+class AnimalType(Enum):
+    CHICKEN = {"speed": 2, "value": 10, "health": 1, "pattern": "hop", "size": 25}
+    DEER = {"speed": 6, "value": 25, "health": 2, "pattern": "flee", "size": 50}
+    BEAR = {"speed": 2, "value": 50, "health": 3, "pattern": "graze", "size": 50}
+    BIRD = {"speed": 6, "value": 25, "health": 1, "pattern": "fly", "size": 35}
+
+# Meat added to the inventory per kill
+ANIMAL_MEAT = {
+    AnimalType.CHICKEN: ("chicken meat", 1),
+    AnimalType.DEER: ("venison", 2),
+    AnimalType.BEAR: ("bear meat", 3),
+    AnimalType.BIRD: ("bird meat", 1)
+}
+
+# One in N frames an animal wandering with this pattern picks a new heading
+TURN_CHANCE = {"hop": 30, "fly": 10, "flee": 20, "graze": 40}
+
+HUNT_FIELD_SIZE = 400
+# Animals move in fixed steps of this many seconds, however often the hunt is drawn
+HUNT_STEP = 0.05
+# Steps one tick() may run before the rest of a long stall is dropped
+MAX_STEPS_PER_TICK = 10
+# Side of the spatial hash cells the field is split into for hit-testing
+HUNT_CELL_SIZE = 50
+
+# Per-type constants Animal needs every step, resolved once instead of through
+# the Enum's value dict: (pattern, turn chance, wandering speed multiplier, hitbox)
+ANIMAL_TRAITS = {
+    animal_type: (animal_type.value["pattern"],
+                  TURN_CHANCE[animal_type.value["pattern"]],
+                  1.5 if animal_type.value["pattern"] == "fly" else 1.0,
+                  animal_type.value["size"] // 2)
+    for animal_type in AnimalType
+}
+
+class Animal:
+    # Slotted: big hunts hold many of these
+    __slots__ = ('type', 'x', 'y', 'prev_x', 'prev_y', 'rng', 'health', 'current_image',
+                 'original_speed', 'current_speed', 'is_fleeing', 'flee_target', 'movement_angle',
+                 'pattern', 'turn_chance', 'speed_multiplier', 'hitbox')
+
+    # Grazing area animals stay inside until they flee
+    boundary = {
+        'left': 100,
+        'right': 300,
+        'top': 100,
+        'bottom': 300
+    }
+
+    def __init__(self, animal_type, x, y, rng=random):
+        self.type = animal_type
+        self.pattern, self.turn_chance, self.speed_multiplier, self.hitbox = ANIMAL_TRAITS[animal_type]
+        self.x = x
+        self.y = y
+        self.prev_x = x  # Position before the last step, for interpolation
+        self.prev_y = y
+        self.rng = rng
+        self.health = animal_type.value["health"]
+        self.current_image = 'right'
+        self.original_speed = animal_type.value["speed"]
+        self.current_speed = self.original_speed
+        self.is_fleeing = False
+
+        # Initialize flee_target to a safe default
+        self.flee_target = (0, 0)  # Will get a better value when needed
+
+        self.movement_angle = math.radians(rng.randint(0, 360))
+
+    def get_nearest_edge(self):
+        distances = [
+            (0, self.y, self.x),
+            (HUNT_FIELD_SIZE, self.y, HUNT_FIELD_SIZE - self.x),
+            (self.x, 0, self.y),
+            (self.x, HUNT_FIELD_SIZE, HUNT_FIELD_SIZE - self.y)
+        ]
+        closest = min(distances, key=lambda x: x[2])
+        return (closest[0], closest[1])
+
+    def handle_hit(self, damage):
+        self.health -= damage
+        if self.type == AnimalType.BEAR:
+            self.current_speed = self.original_speed * 2
+        elif self.type == AnimalType.DEER:
+            self.current_speed = self.original_speed * 1.5
+        self.is_fleeing = True
+        self.flee_target = self.get_nearest_edge()
+
+    def scare(self):
+        self.is_fleeing = True
+        self.flee_target = self.get_nearest_edge()
+
+    def check_boundary(self, new_x, new_y):
+        if not self.is_fleeing:
+            if new_x < self.boundary['left'] or new_x > self.boundary['right']:
+                self.movement_angle = math.pi - self.movement_angle
+                return False
+            if new_y < self.boundary['top'] or new_y > self.boundary['bottom']:
+                self.movement_angle = -self.movement_angle
+                return False
+        return True
+
+    def move(self):
+        self.prev_x = self.x
+        self.prev_y = self.y
+        if self.health <= 0:
+            return
+
+        dx, dy = 0, 0
+
+        if self.is_fleeing:
+            dx = self.flee_target[0] - self.x
+            dy = self.flee_target[1] - self.y
+            distance = math.hypot(dx, dy)
+            if distance > 0:
+                dx = dx / distance * self.current_speed
+                dy = dy / distance * self.current_speed
+                self.x += dx
+                self.y += dy
+        else:
+            if self.rng.randint(0, self.turn_chance) == 0:
+                self.movement_angle = math.radians(self.rng.randint(0, 360))
+
+            dx = math.cos(self.movement_angle) * self.current_speed * self.speed_multiplier
+            dy = math.sin(self.movement_angle) * self.current_speed * self.speed_multiplier
+
+            new_x = self.x + dx
+            new_y = self.y + dy
+            if self.check_boundary(new_x, new_y):
+                self.x = new_x
+                self.y = new_y
+
+        # Face the direction of travel; keep the current image when dx is 0
+        if dx > 0:
+            self.current_image = 'right'
+        elif dx < 0:
+            self.current_image = 'left'
+
+        self.x = max(0, min(self.x, HUNT_FIELD_SIZE))
+        self.y = max(0, min(self.y, HUNT_FIELD_SIZE))
+
+    def is_at_edge(self):
+        margin = 5
+        return (self.x <= margin or self.x >= HUNT_FIELD_SIZE - margin or
+                self.y <= margin or self.y >= HUNT_FIELD_SIZE - margin)
+
+    def interpolated_position(self, alpha):
+        """Where to draw the animal alpha (0-1) of the way through the current step"""
+        return (self.prev_x + (self.x - self.prev_x) * alpha,
+                self.prev_y + (self.y - self.prev_y) * alpha)
+
+    def image_key(self):
+        """'left', 'right' or 'dead'"""
+        if self.health <= 0:
+            return 'dead'
+        return self.current_image
+
+    def get_hitbox_size(self):
+        return self.hitbox
+
+# Furthest a shot can reach an animal: it scares within twice its hitbox
+SCARE_RADIUS = max(animal_type.value["size"] // 2 for animal_type in AnimalType) * 2
+
+class SpatialHash:
+    """Uniform grid of animals, so a shot only looks at the cells around it"""
+
+    def __init__(self, cell_size=HUNT_CELL_SIZE):
+        self.cell_size = cell_size
+        self.cells = {}  # (cell x, cell y) -> set of animals
+        self.cell_of = {}  # animal -> its cell
+        self.order = {}  # animal -> insertion number, to return animals in spawn order
+        self.inserted = 0
+
+    def __len__(self):
+        return len(self.cell_of)
+
+    def cell(self, x, y):
+        return (int(x // self.cell_size), int(y // self.cell_size))
+
+    def insert(self, animal):
+        cell = self.cell(animal.x, animal.y)
+        self.cells.setdefault(cell, set()).add(animal)
+        self.cell_of[animal] = cell
+        self.order[animal] = self.inserted
+        self.inserted += 1
+
+    def remove(self, animal):
+        cell = self.cell_of.pop(animal)
+        del self.order[animal]
+        members = self.cells[cell]
+        members.discard(animal)
+        if not members:
+            del self.cells[cell]
+
+    def move(self, animal):
+        """Call after the animal's position changed"""
+        cell = self.cell(animal.x, animal.y)
+        old = self.cell_of[animal]
+        if cell == old:
+            return
+        members = self.cells[old]
+        members.discard(animal)
+        if not members:
+            del self.cells[old]
+        self.cells.setdefault(cell, set()).add(animal)
+        self.cell_of[animal] = cell
+
+    def query(self, x, y, radius):
+        """Animals in the cells touching the square of side 2 * radius around (x, y)"""
+        min_x, min_y = self.cell(x - radius, y - radius)
+        max_x, max_y = self.cell(x + radius, y + radius)
+        found = []
+        for cell_y in range(min_y, max_y + 1):
+            for cell_x in range(min_x, max_x + 1):
+                members = self.cells.get((cell_x, cell_y))
+                if members:
+                    found.extend(members)
+        found.sort(key=self.order.__getitem__)
+        return found
+
+class HuntingEngine(MinigameEngine):
+    """A timed hunt simulated in fixed HUNT_STEP steps.
+
+    tick(dt) runs however many steps fit in the real time that passed, so
+    animal speed doesn't depend on the frame rate; step_alpha says how far
+    into the next step the clock is, for drawing in between.
+    """
+
+    actions = ('shoot', 'reload')
+
+    def __init__(self, game_state, rng=None, duration=60):
+        super().__init__(game_state, rng)
+        self.duration = duration
+        self.elapsed = 0.0
+        self.steps = 0  # Fixed steps run so far
+        self.accumulator = 0.0  # Real time not yet simulated
+        self.score = 0
+        self.animals = []
+        self.grid = SpatialHash()
+        self.spawn_timer = 0
+        self.last_shot_time = None
+        self.spawn_animals(initial=True)
+
+    @property
+    def has_rifle(self):
+        return 'hunting_rifle' in self.game_state.inventory
+
+    @property
+    def weapon_name(self):
+        return "Hunting Rifle" if self.has_rifle else "Revolver"
+
+    @property
+    def cooldown(self):
+        return 3.0 if self.has_rifle else 1.0
+
+    @property
+    def time_remaining(self):
+        return max(0.0, self.duration - self.elapsed)
+
+    def cooldown_remaining(self):
+        if self.last_shot_time is None:
+            return 0.0
+        return max(0.0, self.cooldown - (self.elapsed - self.last_shot_time))
+
+    def shoot(self, x, y):
+        if self.cooldown_remaining() > 0:
+            return
+        inventory = self.game_state.inventory
+        if inventory.get('bullets', 0) <= 0:
+            self.say("No bullets!")
+            return
+
+        self.last_shot_time = self.elapsed
+        damage = 2 if self.has_rifle else 1
+        inventory['bullets'] -= 1
+        if inventory['bullets'] <= 0:
+            del inventory['bullets']
+
+        for animal in self.grid.query(x, y, SCARE_RADIUS):
+            distance = math.hypot(x - animal.x, y - animal.y)
+            if distance < animal.get_hitbox_size():
+                animal.handle_hit(damage)
+                if animal.health <= 0:
+                    self.score += animal.type.value["value"]
+                    item, amount = ANIMAL_MEAT[animal.type]
+                    self.game_state.add_inventory_item(item, amount)
+                    self.say(f"Shot a {animal.type.name.lower()}!")
+            elif distance < animal.get_hitbox_size() * 2:
+                animal.scare()
+
+    def reload(self):
+        if self.has_rifle:
+            self.last_shot_time = None  # Reset cooldown
+            self.say("Reloaded!")
+
+    def spawn_animals(self, initial=False):
+        if initial:
+            for animal_type, count in ((AnimalType.CHICKEN, 2), (AnimalType.DEER, 2),
+                                       (AnimalType.BEAR, 1), (AnimalType.BIRD, 2)):
+                for _ in range(count):
+                    self.spawn_animal(animal_type)
+        else:
+            self.spawn_timer += 1
+            if self.spawn_timer >= 20:
+                self.spawn_timer = 0
+                if self.rng.randint(0, 100) < 30:
+                    self.spawn_animal(self.rng.choice(list(AnimalType)))
+
+    def spawn_animal(self, animal_type):
+        center_x, center_y = 200, 200
+        spawn_radius = 100
+
+        angle = math.radians(self.rng.randint(0, 360))
+        distance = self.rng.randint(20, spawn_radius)
+
+        x = center_x + math.cos(angle) * distance
+        y = center_y + math.sin(angle) * distance
+        animal = Animal(animal_type, x, y, self.rng)
+        self.animals.append(animal)
+        self.grid.insert(animal)
+
+    @property
+    def step_alpha(self):
+        return self.accumulator / HUNT_STEP
+
+    def update(self):
+        """Advance the hunt by exactly one HUNT_STEP"""
+        self.steps += 1
+        self.elapsed += HUNT_STEP
+        self.spawn_animals()
+        remaining = []
+        for animal in self.animals:
+            animal.move()
+            if animal.is_at_edge():
+                self.grid.remove(animal)
+            else:
+                self.grid.move(animal)
+                remaining.append(animal)
+        self.animals = remaining
+        if self.elapsed >= self.duration - 1e-9:
+            self.finish('time_up', f"Hunt finished!\nScore: {self.score}")
+
+    def tick(self, dt):
+        start = len(self.messages)
+        self.accumulator += dt
+        steps = 0
+        while self.accumulator >= HUNT_STEP and not self.finished:
+            if steps == MAX_STEPS_PER_TICK:
+                self.accumulator = 0.0  # Too far behind to catch up; let the hunt slow down
+                break
+            self.update()
+            self.accumulator -= HUNT_STEP
+            steps += 1
+        return self.messages[start:]
+
+
+# Mining
+
+class TileState(Enum):
+    HIDDEN = "hidden"  # Dark grey tile (unmined)
+    REVEALED = "revealed"  # Empty space (mined)
+    COLLAPSED = "collapsed"  # Black tile (landslide, unmovable)
+
+class MiningEngine(MinigameEngine):
+    """Dig outwards from the top row of a plains dig site"""
+
+    actions = ('dig',)
+
+    def __init__(self, game_state, rng=None, grid_size=10):
+        super().__init__(game_state, rng)
+        self.grid_size = grid_size
+        self.tiles = [[TileState.HIDDEN for _ in range(grid_size)]
+                      for _ in range(grid_size)]
+        self.health = 100
+        self.energy = 100
+
+    def is_adjacent_to_revealed(self, x, y):
+        if y == 0:  # Top row is always mineable
+            return True
+
+        adjacent = [(x-1, y), (x+1, y), (x, y-1), (x, y+1)]
+        return any(0 <= ax < self.grid_size and 0 <= ay < self.grid_size and
+                   self.tiles[ay][ax] == TileState.REVEALED
+                   for ax, ay in adjacent)
+
+    def can_dig(self, x, y):
+        return (0 <= x < self.grid_size and 0 <= y < self.grid_size and
+                self.tiles[y][x] == TileState.HIDDEN and
+                self.is_adjacent_to_revealed(x, y))
+
+    def dig(self, x, y):
+        if self.energy <= 0:
+            self.finish('exhausted', "Too tired to continue mining!")
+            return
+        if self.health <= 0:
+            self.finish('injured', "You're too injured to continue mining!")
+            return
+        if not self.can_dig(x, y):
+            return
+
+        self.energy = max(0, self.energy - 10)
+        self.tiles[y][x] = TileState.REVEALED
+
+        if self.rng.random() < 0.3:  # 30% chance of cave-in
+            self.health = max(0, self.health - 20)
+            self.say("Cave-in! You took damage!")
+
+            # Mark the tile and adjacent tiles as collapsed
+            self.tiles[y][x] = TileState.COLLAPSED
+            for dx, dy in [(0, 1), (0, -1), (1, 0), (-1, 0)]:
+                new_x, new_y = x + dx, y + dy
+                if (0 <= new_x < self.grid_size and
+                        0 <= new_y < self.grid_size and
+                        self.tiles[new_y][new_x] == TileState.HIDDEN):
+                    self.tiles[new_y][new_x] = TileState.COLLAPSED
+            return
+
+        # Reward and possible mineshaft discovery
+        reward_roll = self.rng.random()
+        if reward_roll < 0.03:  # 3% chance to find a mineshaft
+            self.game_state.add_mineshaft()
+            self.finish('mineshaft',
+                        "You've discovered a mineshaft! You'll need a pickaxe to mine here.")
+        elif reward_roll < 0.4:  # 37% copper
+            amount = self.rng.randint(1, 3)
+            self.game_state.add_inventory_item("copper ore", amount)
+            self.say(f"Found {amount} copper ore!")
+        elif reward_roll < 0.7:  # 30% iron
+            amount = self.rng.randint(1, 2)
+            self.game_state.add_inventory_item("iron ore", amount)
+            self.say(f"Found {amount} iron ore!")
+        else:  # 30% coins
+            amount = self.rng.randint(5, 15)
+            self.game_state.coins += amount
+            self.say(f"Found {amount} coins!")
+
+
+# Mineshaft
+
+class TileType(Enum):
+    WALL = "wall"  # Dark grey wall
+    PATH = "path"  # Empty space
+    SILVER = "silver"  # Silver ore node
+    GOLD = "gold"    # Gold ore node
+    DIAMOND = "diamond"  # Diamond node
+
+# Ore nodes: item mined and how many of it
+ORE_YIELDS = {
+    TileType.SILVER: ("silver ore", (1, 2)),
+    TileType.GOLD: ("gold ore", (1, 1)),
+    TileType.DIAMOND: ("diamond", (1, 1))
+}
+
+class MineshaftEngine(MinigameEngine):
+    """Walk a generated cave and mine ore nodes"""
+
+    actions = ('move', 'mine')
+
+    def __init__(self, game_state, rng=None, grid_size=20):
+        super().__init__(game_state, rng)
+        self.grid_size = grid_size
+        self.tiles = [[TileType.WALL for _ in range(grid_size)]
+                      for _ in range(grid_size)]
+        self.health = 100
+        self.energy = 100
+        self.player_pos = [1, 1]  # Start near top-left
+
+        self.generate_cave()
+        self.add_resource_nodes()
+
+    def generate_cave(self):
+        # Start with a small room at player position
+        self.create_room(self.player_pos[0], self.player_pos[1], 3)
+
+        # Generate multiple connected rooms
+        num_rooms = self.rng.randint(8, 12)
+        for _ in range(num_rooms):
+            room_x = self.rng.randint(2, self.grid_size - 3)
+            room_y = self.rng.randint(2, self.grid_size - 3)
+            room_size = self.rng.randint(3, 5)
+            self.create_room(room_x, room_y, room_size)
+
+            # Connect to nearest room with tunnels
+            self.connect_to_nearest_path(room_x, room_y)
+
+    def create_room(self, center_x, center_y, size):
+        half = size // 2
+        for y in range(max(0, center_y - half), min(self.grid_size, center_y + half + 1)):
+            for x in range(max(0, center_x - half), min(self.grid_size, center_x + half + 1)):
+                self.tiles[y][x] = TileType.PATH
+
+    def connect_to_nearest_path(self, start_x, start_y):
+        # Find nearest existing path tile
+        min_dist = float('inf')
+        nearest = None
+        for y in range(self.grid_size):
+            for x in range(self.grid_size):
+                if self.tiles[y][x] == TileType.PATH:
+                    dist = math.hypot(x - start_x, y - start_y)
+                    if dist < min_dist and dist > 2:  # Avoid connecting to same room
+                        min_dist = dist
+                        nearest = (x, y)
+
+        if nearest:
+            # Create tunnel
+            current_x, current_y = start_x, start_y
+            while (current_x, current_y) != nearest:
+                self.tiles[current_y][current_x] = TileType.PATH
+                if abs(current_x - nearest[0]) > abs(current_y - nearest[1]):
+                    current_x += 1 if nearest[0] > current_x else -1
+                else:
+                    current_y += 1 if nearest[1] > current_y else -1
+
+    def add_resource_nodes(self):
+        path_tiles = [(x, y) for y in range(self.grid_size)
+                      for x in range(self.grid_size)
+                      if self.tiles[y][x] == TileType.PATH]
+
+        # Add resources based on available space
+        num_tiles = len(path_tiles)
+        num_silver = max(2, num_tiles // 20)  # About 5% silver
+        num_gold = max(1, num_tiles // 40)    # About 2.5% gold
+        num_diamond = max(1, num_tiles // 60)  # About 1.7% diamond
+
+        for resource, count in [(TileType.SILVER, num_silver),
+                                (TileType.GOLD, num_gold),
+                                (TileType.DIAMOND, num_diamond)]:
+            for _ in range(count):
+                if path_tiles:
+                    pos = self.rng.choice(path_tiles)
+                    path_tiles.remove(pos)
+                    self.tiles[pos[1]][pos[0]] = resource
+
+    def move(self, dx, dy):
+        new_x = self.player_pos[0] + dx
+        new_y = self.player_pos[1] + dy
+
+        if (0 <= new_x < self.grid_size and
+                0 <= new_y < self.grid_size and
+                self.tiles[new_y][new_x] != TileType.WALL):
+            self.player_pos = [new_x, new_y]
+
+    def mine(self):
+        x, y = self.player_pos
+        tile = self.tiles[y][x]
+        if tile not in ORE_YIELDS:
+            return
+
+        if not self.game_state.can_mine():
+            self.say("You need a pickaxe to mine here!")
+            return
+
+        self.energy = max(0, self.energy - 15)
+
+        if self.rng.random() < 0.7:  # 70% success rate
+            item, (low, high) = ORE_YIELDS[tile]
+            amount = self.rng.randint(low, high)
+            self.game_state.add_inventory_item(item, amount)
+            self.say(f"Mined {amount} {item}!")
+            self.tiles[y][x] = TileType.PATH
+        else:
+            self.say("Failed to mine the resource!")
+
+        if self.energy <= 0:
+            self.finish('exhausted', "Too tired to continue mining!")
+
+
+# Fishing
+
+class FishingEngine(MinigameEngine):
+    """Type each fish name before the (shrinking) time limit runs out"""
+
+    actions = ('start', 'answer')
+
+    fish_types = ["cod", "bass", "trout", "salmon", "angelfish", "hammerhead shark"]
+
+    def __init__(self, game_state, rng=None):
+        super().__init__(game_state, rng)
+        self.time_limit = 2.0
+        self.round_elapsed = 0.0
+        self.current_fish = None
+        self.score = 0
+
+    @property
+    def started(self):
+        return self.current_fish is not None
+
+    @property
+    def time_remaining(self):
+        return max(0.0, self.time_limit - self.round_elapsed)
+
+    def start(self):
+        if 'fishing_rod' not in self.game_state.inventory:
+            self.finish('no_rod', "You need a fishing rod to fish!")
+            return
+        if not self.started:
+            self.next_fish()
+
+    def next_fish(self):
+        self.round_elapsed = 0.0
+        self.current_fish = self.rng.choice(self.fish_types)
+
+    def answer(self, text):
+        if not self.started:
+            return
+        if self.round_elapsed > self.time_limit:
+            self.game_over()
+        elif text.strip() == self.current_fish:
+            self.score += 1
+            self.game_state.add_inventory_item(self.current_fish, 1)
+            self.say(f"Caught a {self.current_fish}!")
+
+            # Less time for each following fish
+            self.time_limit = max(0.5, self.time_limit - 0.1)
+            self.next_fish()
+
+    def game_over(self):
+        self.finish('time_up', f"Fishing session ended!\nYou caught {self.score} fish!")
+
+    def tick(self, dt):
+        start = len(self.messages)
+        if self.started and not self.finished:
+            self.round_elapsed += dt
+            if self.round_elapsed > self.time_limit:
+                self.game_over()
+        return self.messages[start:]
+
+
+# House looting
+
+# Coin multiplier on looted trinkets by town size
+TOWN_LOOT_MULTIPLIER = {'small': 1, 'medium': 1.5, 'large': 2}
+
+class HouseLootEngine(MinigameEngine):
+    """Grab trinkets and reach an exit before the guards catch you"""
+
+    actions = ('move', 'leave')
+
+    guard_interval = 0.5  # Seconds between guard moves
+
+    def __init__(self, game_state, rng=None, town_type='small', grid_width=15, grid_height=15):
+        super().__init__(game_state, rng)
+        self.town_type = town_type
+        self.grid_width = grid_width
+        self.grid_height = grid_height
+
+        self.player_pos = (1, 1)
+        self.guards = []
+        self.guard_types = []  # 'chase' or 'patrol'
+        self.guard_patrol_points = []  # For patrol guards
+        self.trinkets = set()
+        self.walls = set()
+        self.exits = []
+        self.collected_trinkets = 0
+        self.total_trinkets = self.rng.randint(5, 10)
+        self.guard_timer = 0.0
+
+        self.setup_game()
+
+    def is_open(self, pos):
+        x, y = pos
+        return (pos not in self.walls and
+                0 <= x < self.grid_width and 0 <= y < self.grid_height)
+
+    def random_open_tile(self):
+        return (self.rng.randint(1, self.grid_width - 2),
+                self.rng.randint(1, self.grid_height - 2))
+
+    def setup_game(self):
+        self.generate_maze()
+
+        # Ensure starting position is clear
+        self.walls.discard(self.player_pos)
+
+        # Place trinkets in open spaces
+        while len(self.trinkets) < self.total_trinkets:
+            pos = self.random_open_tile()
+            if pos not in self.walls and pos != self.player_pos:
+                self.trinkets.add(pos)
+
+        # Place guards with different behaviors
+        num_guards = 2
+        for _ in range(num_guards):
+            while True:
+                pos = self.random_open_tile()
+                if pos not in self.walls and pos not in self.trinkets and pos != self.player_pos:
+                    self.guards.append(pos)
+                    guard_type = 'chase' if self.rng.random() < 0.5 else 'patrol'
+                    self.guard_types.append(guard_type)
+                    if guard_type == 'patrol':
+                        self.guard_patrol_points.append(self.generate_patrol_points())
+                    else:
+                        self.guard_patrol_points.append([])
+                    break
+
+    def generate_maze(self):
+        # Walls around the border and on a random subset of even grid points
+        for x in range(self.grid_width):
+            for y in range(self.grid_height):
+                if (x == 0 or x == self.grid_width-1 or
+                        y == 0 or y == self.grid_height-1):
+                    self.walls.add((x, y))
+                elif x % 2 == 0 and y % 2 == 0:
+                    if self.rng.random() < 0.7:  # 70% chance of wall
+                        self.walls.add((x, y))
+
+        # Exits are border tiles next to an open tile
+        possible_exits = []
+        for i in range(1, self.grid_width-1):
+            if (i, 1) not in self.walls:
+                possible_exits.append((i, 0))
+            if (i, self.grid_height-2) not in self.walls:
+                possible_exits.append((i, self.grid_height-1))
+        for i in range(1, self.grid_height-1):
+            if (1, i) not in self.walls:
+                possible_exits.append((0, i))
+            if (self.grid_width-2, i) not in self.walls:
+                possible_exits.append((self.grid_width-1, i))
+
+        num_exits = self.rng.randint(2, 3)
+        self.exits = self.rng.sample(possible_exits, min(len(possible_exits), num_exits))
+        for exit_pos in self.exits:
+            self.walls.discard(exit_pos)
+
+    def generate_patrol_points(self):
+        points = []
+        for _ in range(4):  # 4 patrol points for each patrol guard
+            while True:
+                pos = self.random_open_tile()
+                if pos not in self.walls and pos not in points:
+                    points.append(pos)
+                    break
+        return points
+
+    def find_path(self, start, goal):
+        """BFS path from start to goal (excluding start), trying moves towards the goal first"""
+        queue = deque([(start, [])])
+        visited = {start}
+
+        gx, gy = goal
+        sx, sy = start
+        preferred_dx = 1 if gx > sx else -1 if gx < sx else 0
+        preferred_dy = 1 if gy > sy else -1 if gy < sy else 0
+        directions = sorted([(0, 1), (1, 0), (0, -1), (-1, 0)],
+                            key=lambda d: abs(d[0] - preferred_dx) + abs(d[1] - preferred_dy))
+
+        while queue:
+            current, path = queue.popleft()
+            if current == goal:
+                return path
+            for dx, dy in directions:
+                next_pos = (current[0] + dx, current[1] + dy)
+                if next_pos not in visited and self.is_open(next_pos):
+                    visited.add(next_pos)
+                    queue.append((next_pos, path + [next_pos]))
+
+        return None
+
+    def move_guards(self):
+        for i, (guard, guard_type) in enumerate(zip(self.guards, self.guard_types)):
+            target = self.player_pos
+            if guard_type == 'patrol':
+                player_distance = abs(guard[0] - self.player_pos[0]) + abs(guard[1] - self.player_pos[1])
+                patrol_points = self.guard_patrol_points[i]
+                if player_distance > 3 and patrol_points:
+                    # Continue patrol unless the player is close
+                    if guard == patrol_points[0]:
+                        patrol_points.append(patrol_points.pop(0))
+                    target = patrol_points[0]
+
+            path = self.find_path(guard, target)
+            if path and len(path) > 1:
+                self.guards[i] = path[0]
+
+        if self.player_pos in self.guards:
+            self.end_game(False)
+
+    def move(self, dx, dy):
+        new_pos = (self.player_pos[0] + dx, self.player_pos[1] + dy)
+        if new_pos in self.walls:
+            return
+        self.player_pos = new_pos
+
+        if self.player_pos in self.exits:
+            self.end_game(True)
+            return
+
+        if self.player_pos in self.trinkets:
+            self.trinkets.remove(self.player_pos)
+            self.collected_trinkets += 1
+
+        if self.player_pos in self.guards:
+            self.end_game(False)
+
+    def leave(self):
+        self.end_game(False)
+
+    def end_game(self, success):
+        if success:
+            base_reward = 100  # Per trinket
+            multiplier = TOWN_LOOT_MULTIPLIER.get(self.town_type, 1)
+            total_reward = int(self.collected_trinkets * base_reward * multiplier)
+            self.game_state.coins += total_reward
+            self.finish('escaped', f"Success! You collected {self.collected_trinkets} trinkets "
+                                   f"and earned {total_reward} coins!")
+        else:
+            self.finish('caught', "You were caught by the guards!")
+
+    def tick(self, dt):
+        start = len(self.messages)
+        self.guard_timer += dt
+        while self.guard_timer >= self.guard_interval and not self.finished:
+            self.guard_timer -= self.guard_interval
+            self.move_guards()
+        return self.messages[start:]
+
+
+# Combat
+
+class EnemyType(Enum):
+    # City enemies
+    BANDIT = {"tier": 1, "hp": 30, "damage": 5, "drops": {"coins": (10, 20), "lockpick": 0.3}}
+    GUARD = {"tier": 2, "hp": 50, "damage": 8, "drops": {"coins": (20, 40), "iron_bar": 0.2}}
+    KNIGHT = {"tier": 3, "hp": 80, "damage": 12, "drops": {"coins": (40, 80), "advanced_map": 0.1}}
+
+    # Forest enemies
+    WOLF = {"tier": 1, "hp": 25, "damage": 6, "drops": {"coins": (8, 15), "wolf_pelt": 0.5}}
+    ARCHER = {"tier": 2, "hp": 40, "damage": 10, "drops": {"coins": (15, 30), "arrows": 0.4}}
+    ENT = {"tier": 3, "hp": 100, "damage": 15, "drops": {"coins": (30, 60), "magic_wood": 0.3}}
+
+    # Plains enemies
+    TOURIST = {"tier": 1, "hp": 20, "damage": 3, "drops": {"coins": (15, 25), "map": 0.4}}
+    HUNTER = {"tier": 2, "hp": 45, "damage": 7, "drops": {"coins": (25, 45), "bullets": 0.3}}
+    BUFFALO = {"tier": 3, "hp": 90, "damage": 14, "drops": {"coins": (35, 70), "leather": 0.5}}
+
+    # Water enemies
+    CRAB = {"tier": 1, "hp": 22, "damage": 4, "drops": {"coins": (12, 18), "crab_meat": 0.6}}
+    SHARK = {"tier": 2, "hp": 55, "damage": 9, "drops": {"coins": (22, 38), "shark_fin": 0.3}}
+    MERMAN = {"tier": 3, "hp": 70, "damage": 11, "drops": {"coins": (45, 75), "pearl": 0.2}}
+
+# Enemy attack dice by tier: (number of dice, sides per die, modifier)
+ENEMY_DICE = {
+    1: (1, 6, 1),
+    2: (2, 6, 2),
+    3: (3, 8, 3)
+}
+
+# Enemies met at strongholds, by terrain, in tier order
+ENEMY_POOLS = {
+    'city': [EnemyType.BANDIT, EnemyType.GUARD, EnemyType.KNIGHT],
+    'forest': [EnemyType.WOLF, EnemyType.ARCHER, EnemyType.ENT],
+    'plains': [EnemyType.TOURIST, EnemyType.HUNTER, EnemyType.BUFFALO],
+    'water': [EnemyType.CRAB, EnemyType.SHARK, EnemyType.MERMAN]
+}
+
+def enemy_pool_for(terrain):
+    if terrain == 'F':
+        return ENEMY_POOLS['forest']
+    elif terrain == 'P':
+        return ENEMY_POOLS['plains']
+    elif terrain in ['O', 'C', 'B']:  # Water (Ocean, Coast, Beach)
+        return ENEMY_POOLS['water']
+    return ENEMY_POOLS['city']  # Towns and anything unrecognised
+
+# Per-type constants, resolved once: (name, max hp, base damage, attack dice, drops)
+ENEMY_TRAITS = {
+    enemy_type: (enemy_type.name.lower().replace('_', ' ').title(),
+                 enemy_type.value["hp"],
+                 enemy_type.value["damage"],
+                 ENEMY_DICE[enemy_type.value["tier"]],
+                 enemy_type.value["drops"])
+    for enemy_type in EnemyType
+}
+
+def turns_to_kill(dice_config):
+    """Expected hits for dice_config to kill each EnemyType"""
+    return {enemy_type: expected_hits_to_kill(dice_config, enemy_type.value["hp"])
+            for enemy_type in EnemyType}
+
+class Enemy:
+    __slots__ = ('type', 'name', 'max_hp', 'hp', 'base_damage', 'num_dice', 'dice_sides',
+                 'modifier', 'drops', 'distribution')
+
+    def __init__(self, enemy_type):
+        self.type = enemy_type
+        # base_damage is kept for reference; attacks roll the dice
+        self.name, self.max_hp, self.base_damage, dice, self.drops = ENEMY_TRAITS[enemy_type]
+        self.hp = self.max_hp
+        self.num_dice, self.dice_sides, self.modifier = dice
+        self.distribution = get_distribution(dice)
+
+    def attack(self, rng=random):
+        return self.distribution.sample(rng)
+
+    def take_damage(self, damage):
+        self.hp = max(0, self.hp - damage)
+        return self.hp <= 0
+
+    def get_drops(self, rng=random):
+        drops = {}
+        for item, chance in self.drops.items():
+            if isinstance(chance, tuple):
+                drops[item] = rng.randint(chance[0], chance[1])
+            elif rng.random() < chance:
+                drops[item] = 1
+        return drops
+
+# Healing items usable in combat and the HP they restore
+HEALING_ITEMS = {
+    "chicken meal": 25,
+    "venison meal": 25,
+    "bear meal": 25,
+    "bird meal": 25
+}
+
+PLAYER_MAX_HP = 100
+
+class CombatEngine(MinigameEngine):
+    """Turn-based stronghold fight: each player action is answered by the enemy"""
+
+    actions = ('attack', 'use_item', 'run')
+
+    def __init__(self, game_state, stronghold_tier, surrounding_terrains, rng=None):
+        super().__init__(game_state, rng)
+        self.tier = stronghold_tier
+        self.enemy = self.generate_enemy(surrounding_terrains)
+        self.player_hp = PLAYER_MAX_HP
+        self.drops = {}
+
+    def generate_enemy(self, surrounding_terrains):
+        # Terrain is picked in proportion to how much of the surroundings it covers
+        terrain = self.rng.choice(list(surrounding_terrains)) if surrounding_terrains else 'T'
+        pool = enemy_pool_for(terrain)
+        tier_index = max(0, min(2, self.tier - 1))  # Tiers 1-3
+        return Enemy(pool[tier_index])
+
+    def usable_items(self):
+        return {item: heal for item, heal in HEALING_ITEMS.items()
+                if self.game_state.inventory.get(item, 0) > 0}
+
+    def attack(self):
+        weapon = self.game_state.get_current_weapon("combat")
+        damage = weapon.roll_damage(self.rng)
+        killed = self.enemy.take_damage(damage)
+        self.say(f"You hit the {self.enemy.name} with your {weapon.name} for {damage} damage!")
+
+        if killed:
+            self.handle_victory()
+        else:
+            self.enemy_turn()
+
+    def use_item(self, item):
+        heal = HEALING_ITEMS.get(item)
+        if heal is None or self.game_state.inventory.get(item, 0) <= 0:
+            return
+        self.game_state.inventory[item] -= 1
+        self.player_hp = min(PLAYER_MAX_HP, self.player_hp + heal)
+        self.say(f"Used {item} to heal {heal} HP!")
+        self.enemy_turn()
+
+    def run(self):
+        if self.rng.random() < 0.5:  # 50% chance to run
+            self.finish('fled', "You successfully ran away!")
+        else:
+            self.say("Couldn't escape!")
+            self.enemy_turn()
+
+    def enemy_turn(self):
+        damage = self.enemy.attack(self.rng)
+        self.player_hp -= damage
+        self.say(f"The {self.enemy.name} hits you for {damage} damage!")
+        if self.player_hp <= 0:
+            self.handle_defeat()
+
+    def handle_victory(self):
+        self.say(f"You defeated the {self.enemy.name}!")
+        self.drops = self.enemy.get_drops(self.rng)
+
+        drop_message = "You received:\n"
+        for item, amount in self.drops.items():
+            if item == "coins":
+                self.game_state.coins += amount
+                drop_message += f"{amount} coins\n"
+            else:
+                self.game_state.add_inventory_item(item, amount)
+                drop_message += f"{amount} {item}\n"
+        self.finish('victory', drop_message)
+
+    def handle_defeat(self):
+        lost_coins = self.game_state.coins // 4  # Lose 25% of coins
+        self.game_state.coins -= lost_coins
+        self.finish('defeat', f"You were defeated by the {self.enemy.name}!\n"
+                              f"You lost {lost_coins} coins.")
@@ -0,0 +1,457 @@
+"""
+Display-free economy and progression simulation.
+
+Agents play a seeded GameState through the headless mini-game engines,
+walking between points of interest, gathering, trading and fighting, until
+they own a tier-5 weapon or run out of play time. Many runs are spread over
+a process pool and summarised into coins/hour, items/hour, deaths/hour and
+hours to a tier-5 weapon:
+
+    python simulation.py --runs 10000 --agent scripted --workers 8
+
+Play time is an estimate: PLAY_SECONDS per action, the hunt's own clock and
+typing time for fishing. The summary splits it by activity and warns when
+a figure leaves SANITY_RANGES, which usually means the clock undercharges
+something rather than that the game is balanced that way. Check both
+before tuning prices from these numbers.
+"""
+import argparse
+import json
+import math
+import os
+import random
+import statistics
+import time
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+
+from game_logic import GameState
+from minigame_engines import (HuntingEngine, MiningEngine, MineshaftEngine, FishingEngine,
+                              CombatEngine, TileType, ORE_YIELDS)
+
+# Estimated seconds of real play per action, used as the simulation clock
+PLAY_SECONDS = {
+    'move': 0.5,
+    'dig': 2.0,
+    'cave_step': 0.3,
+    'mine': 2.0,
+    'chop': 3.0,
+    'trade': 5.0,
+    'combat_turn': 3.0,
+    'session': 10.0  # Opening a mini-game or a town's trade menu and reading the result
+}
+HUNT_AIM_ERROR = 8  # Standard deviation of the agent's aim, in pixels
+TRAVEL_LIMIT = 200  # Give up on a destination after this many steps
+BULLET_RESERVE = 20  # Restock bullets (free at the gunsmith) below this
+TARGET_TIER = 5
+
+# Plausible (low, high) for summary figures; outside them the summary warns
+SANITY_RANGES = {
+    'coins_per_hour': (500, 20000),
+    'hours_to_tier_5_p50': (0.5, 20)  # A tier-5 weapon costs about 2500 coins
+}
+
+# Tools bought by the scripted agent, in order, with what they unlock
+TOOL_PURCHASES = [
+    ("toolsmith", "pickaxe"),
+    ("fisher", "fishing_rod"),
+    ("toolsmith", "shovel"),
+    ("lumberjack", "axe")
+]
+
+ACTIVITIES = ['hunt', 'dig', 'mineshaft', 'chop', 'fish', 'fight', 'trade']
+
+
+class Simulation:
+    """One agent playing one seeded world"""
+
+    def __init__(self, seed, agent, max_hours=10):
+        self.seed = seed
+        # One stream for the agent, the engines and the game, so a run never touches the global random module
+        self.rng = random.Random(seed)
+        self.agent = agent
+        self.max_seconds = max_hours * 3600
+        self.game = GameState(seed=seed, rng=self.rng)
+        self.seconds = 0.0
+        self.coins_earned = 0
+        self.items_gathered = 0
+        self.deaths = 0
+        self.hours_to_target = None
+        self.activity_counts = dict.fromkeys(ACTIVITIES, 0)
+        self.activity_seconds = dict.fromkeys(ACTIVITIES, 0.0)
+
+    @property
+    def hours(self):
+        return self.seconds / 3600
+
+    def spend(self, action, count=1):
+        self.seconds += PLAY_SECONDS[action] * count
+
+    def has_target_weapon(self):
+        return any(weapon.tier >= TARGET_TIER for weapon in self.game.weapons.values())
+
+    def sellable_items(self):
+        """How many carried items some villager will pay for"""
+        inventory = self.game.inventory
+        return sum(inventory.get(item, 0)
+                   for prices in self.game.villager_buy_items.values()
+                   for item, price in prices.items() if price > 0)
+
+    def terrain(self):
+        return self.game.world.get_terrain(self.game.player_x, self.game.player_y)
+
+    # Movement
+
+    def step_towards(self, x, y):
+        game = self.game
+        dx = (x > game.player_x) - (x < game.player_x)
+        dy = (y > game.player_y) - (y < game.player_y)
+        for move in ((dx, 0), (0, dy), (dx, dy), (-dy, dx), (dy, -dx)):
+            if move != (0, 0) and game.can_move_to(game.player_x + move[0], game.player_y + move[1]):
+                game.move_player(*move)
+                self.spend('move')
+                return True
+        return False
+
+    def travel_to(self, x, y):
+        for _ in range(TRAVEL_LIMIT):
+            if (self.game.player_x, self.game.player_y) == (x, y):
+                return True
+            if not self.step_towards(x, y):
+                break
+        return (self.game.player_x, self.game.player_y) == (x, y)
+
+    def explore(self, steps=32):
+        angle = self.rng.uniform(0, 2 * math.pi)
+        target = (self.game.player_x + round(math.cos(angle) * steps),
+                  self.game.player_y + round(math.sin(angle) * steps))
+        self.travel_to(*target)
+
+    def go_to_nearest(self, kind):
+        """Walk to the closest known point of interest, exploring until one turns up"""
+        for _ in range(4):
+            target = self.game.world.nearest(kind, self.game.player_x, self.game.player_y)
+            if target is not None:
+                return self.travel_to(*target)
+            self.explore()
+        return False
+
+    def go_to_terrain(self, terrains, radius=12):
+        """Walk to the closest tile of one of the terrains within radius"""
+        px, py = self.game.player_x, self.game.player_y
+        if self.terrain() in terrains:
+            return True
+        for ring in range(1, radius + 1):
+            for x in range(px - ring, px + ring + 1):
+                for y in (py - ring, py + ring) if abs(x - px) < ring else range(py - ring, py + ring + 1):
+                    if self.game.world.get_terrain(x, y) in terrains:
+                        return self.travel_to(x, y)
+        self.explore()
+        return False
+
+    # Activities; each returns once the session is over
+
+    def track(self, activity, session):
+        """Run session() and credit coins and items it produced"""
+        coins = self.game.coins
+        items = sum(self.game.inventory.values())
+        seconds = self.seconds
+        session()
+        self.coins_earned += max(0, self.game.coins - coins)
+        self.items_gathered += max(0, sum(self.game.inventory.values()) - items)
+        self.activity_counts[activity] += 1
+        self.activity_seconds[activity] += self.seconds - seconds
+
+    def hunt(self):
+        if not self.go_to_terrain(('P', 'F')):
+            return
+        engine = HuntingEngine(self.game, self.rng)
+        self.spend('session')
+        while not engine.finished:
+            if engine.cooldown_remaining() == 0 and engine.animals:
+                target = self.rng.choice(engine.animals)
+                engine.step(('shoot', self.rng.gauss(target.x, HUNT_AIM_ERROR),
+                             self.rng.gauss(target.y, HUNT_AIM_ERROR)))
+            engine.update()  # One fixed step, no frames to keep up with
+        self.seconds += engine.elapsed
+
+    def dig(self):
+        if 'shovel' not in self.game.inventory or not self.go_to_terrain(('P',)):
+            return
+        engine = MiningEngine(self.game, self.rng)
+        self.spend('session')
+        while not engine.finished:
+            options = [(x, y) for y in range(engine.grid_size) for x in range(engine.grid_size)
+                       if engine.can_dig(x, y)]
+            if not options:
+                break
+            engine.step(('dig',) + self.rng.choice(options))
+            self.spend('dig')
+
+    def mineshaft(self):
+        if 'pickaxe' not in self.game.inventory or not self.go_to_nearest('mineshaft'):
+            return
+        engine = MineshaftEngine(self.game, self.rng)
+        self.spend('session')
+        while not engine.finished:
+            path = self.path_to_ore(engine)
+            if not path:
+                break
+            for move in path:
+                engine.step(('move',) + move)
+            self.spend('cave_step', len(path))
+            engine.step(('mine',))
+            self.spend('mine')
+
+    def path_to_ore(self, engine):
+        """Shortest list of moves to the closest ore node, [] if none is reachable"""
+        start = tuple(engine.player_pos)
+        previous = {start: None}
+        frontier = [start]
+        while frontier:
+            next_frontier = []
+            for x, y in frontier:
+                if engine.tiles[y][x] in ORE_YIELDS:
+                    moves = []
+                    pos = (x, y)
+                    while previous[pos] is not None:
+                        before = previous[pos]
+                        moves.append((pos[0] - before[0], pos[1] - before[1]))
+                        pos = before
+                    return moves[::-1] or [(0, 0)]
+                for dx, dy in ((1, 0), (-1, 0), (0, 1), (0, -1)):
+                    nx, ny = x + dx, y + dy
+                    if ((nx, ny) not in previous and 0 <= nx < engine.grid_size and
+                            0 <= ny < engine.grid_size and engine.tiles[ny][nx] != TileType.WALL):
+                        previous[(nx, ny)] = (x, y)
+                        next_frontier.append((nx, ny))
+            frontier = next_frontier
+        return []
+
+    def chop(self):
+        if 'axe' not in self.game.inventory or not self.go_to_terrain(('F',)):
+            return
+        for _ in range(5):
+            success, _ = self.game.attempt_woodcutting()
+            self.spend('chop')
+            if not success or self.terrain() != 'F':
+                break
+
+    def fish(self):
+        if 'fishing_rod' not in self.game.inventory or not self.go_to_terrain(('C', 'O', 'B')):
+            return
+        if self.terrain() == 'B':
+            return  # Beaches border the sea but can't be fished from
+        engine = FishingEngine(self.game, self.rng)
+        self.spend('session')
+        engine.step(('start',))
+        while not engine.finished:
+            # Typing speed: about 0.12s per letter plus reaction time
+            typing_time = 0.3 + 0.12 * len(engine.current_fish) * self.rng.uniform(0.8, 1.5)
+            engine.tick(typing_time)
+            engine.step(('answer', engine.current_fish))
+            self.seconds += typing_time
+
+    def fight(self):
+        if not self.go_to_nearest('stronghold'):
+            return
+        world = self.game.world
+        x, y = self.game.player_x, self.game.player_y
+        engine = CombatEngine(self.game, world.get_stronghold_tier(x, y),
+                              world.get_surrounding_terrains(x, y), self.rng)
+        self.spend('session')
+        while not engine.finished:
+            items = engine.usable_items()
+            if engine.player_hp < 30 and items:
+                engine.step(('use_item', next(iter(items))))
+            elif engine.player_hp < 15:
+                engine.step(('run',))
+            else:
+                engine.step(('attack',))
+            self.spend('combat_turn')
+        if engine.outcome == 'defeat':
+            self.deaths += 1
+
+    def trade(self):
+        """Sell everything sellable in the nearest town, restock bullets and buy tools"""
+        if not self.go_to_nearest('town'):
+            return
+        game = self.game
+        self.spend('session')
+        for villager, prices in game.villager_buy_items.items():
+            for item, price in prices.items():
+                if price > 0 and game.inventory.get(item, 0) > 0:
+                    game.attempt_trade(villager, "sell", item, game.inventory[item])
+                    self.spend('trade')
+        if game.inventory.get('bullets', 0) < BULLET_RESERVE:
+            game.attempt_trade("gunsmith", "buy", "bullets", 1)
+            self.spend('trade')
+        for villager, tool in self.agent.tools_to_buy(self):
+            success, _ = game.attempt_trade(villager, "buy", tool)
+            self.spend('trade')
+            if not success:
+                break
+
+    def buy_target_weapon(self):
+        """Buy the fort's tier-5 weapon if it can be afforded; returns whether one was bought"""
+        world = self.game.world
+        fort = world.nearest('fort', self.game.player_x, self.game.player_y)
+        if fort is None:
+            return False
+        weapon = next(w for w in world.get_fort_inventory(*fort) if w.tier == TARGET_TIER)
+        if self.game.coins < weapon.get_cost() or not self.travel_to(*fort):
+            return False
+        self.spend('trade')
+        # Still the same weapon: stock is deterministic until someone buys from it
+        success, _ = self.game.attempt_trade("fort_keeper", "buy", weapon.id)
+        return success
+
+    def run(self):
+        while self.seconds < self.max_seconds:
+            if self.buy_target_weapon():
+                self.hours_to_target = self.hours
+                break
+            activity = self.agent.choose_activity(self)
+            before = self.seconds
+            self.track(activity, getattr(self, activity))
+            if self.seconds == before:
+                self.explore()  # Nothing to do here (no tools, no town...), move on
+                if self.seconds == before:
+                    break  # Boxed in by ocean without a boat
+        return self.result()
+
+    def result(self):
+        return {
+            'seed': self.seed,
+            'hours': self.hours,
+            'coins_earned': self.coins_earned,
+            'items_gathered': self.items_gathered,
+            'deaths': self.deaths,
+            'hours_to_target': self.hours_to_target,
+            'activities': self.activity_counts,
+            'activity_seconds': self.activity_seconds
+        }
+
+
+class RandomAgent:
+    """Picks any activity it has the tools for, uniformly; sells whenever it hauls enough"""
+
+    def choose_activity(self, sim):
+        if sim.sellable_items() > 30:
+            return 'trade'
+        return sim.rng.choice(ACTIVITIES)
+
+    def tools_to_buy(self, sim):
+        tool = sim.rng.choice(TOOL_PURCHASES)
+        return [tool] if tool[1] not in sim.game.inventory else []
+
+
+class ScriptedAgent:
+    """Hunts until it can buy tools, then favours mineshafts and fishing, with the odd stronghold raid"""
+
+    def choose_activity(self, sim):
+        inventory = sim.game.inventory
+        if sim.sellable_items() > 30 or \
+                inventory.get('bullets', 0) < BULLET_RESERVE or self.tools_to_buy(sim):
+            return 'trade'
+        if sim.rng.random() < 0.1:
+            return 'fight'
+        if 'pickaxe' in inventory and sim.rng.random() < 0.6:
+            return 'mineshaft'
+        if 'fishing_rod' in inventory and sim.rng.random() < 0.5:
+            return 'fish'
+        if 'shovel' in inventory and sim.rng.random() < 0.3:
+            return 'dig'
+        return 'hunt'
+
+    def tools_to_buy(self, sim):
+        inventory = sim.game.inventory
+        costs = sim.game.villager_sell_items
+        wanted = []
+        budget = sim.game.coins
+        for villager, tool in TOOL_PURCHASES:
+            if tool not in inventory and costs[villager][tool] <= budget:
+                wanted.append((villager, tool))
+                budget -= costs[villager][tool]
+        return wanted
+
+
+AGENTS = {
+    'random': RandomAgent,
+    'scripted': ScriptedAgent
+}
+
+def run_one(seed, agent_name='scripted', max_hours=10):
+    """Play one world to completion; module level so a process pool can call it"""
+    return Simulation(seed, AGENTS[agent_name](), max_hours).run()
+
+def run_simulations(runs, agent_name='scripted', max_hours=10, workers=None, base_seed=0):
+    """Results of runs simulations with consecutive seeds, in seed order"""
+    seeds = range(base_seed, base_seed + runs)
+    workers = workers or os.cpu_count() or 1
+    if workers == 1:
+        return [run_one(seed, agent_name, max_hours) for seed in seeds]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        batch = max(1, runs // (workers * 8))
+        return list(pool.map(run_one, seeds, repeat(agent_name), repeat(max_hours), chunksize=batch))
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+def summarize(results):
+    hours = sum(r['hours'] for r in results) or 1.0
+    reached = [r['hours_to_target'] for r in results if r['hours_to_target'] is not None]
+    activities = {name: sum(r['activities'][name] for r in results) for name in ACTIVITIES}
+    activity_hours = {name: sum(r['activity_seconds'][name] for r in results) / 3600 for name in ACTIVITIES}
+    summary = {
+        'runs': len(results),
+        'total_hours': round(hours, 1),
+        'coins_per_hour': round(sum(r['coins_earned'] for r in results) / hours, 1),
+        'items_per_hour': round(sum(r['items_gathered'] for r in results) / hours, 1),
+        'deaths_per_hour': round(sum(r['deaths'] for r in results) / hours, 3),
+        'runs_with_death': round(sum(1 for r in results if r['deaths']) / len(results), 3),
+        'reached_tier_5': round(len(reached) / len(results), 3),
+        'activities': activities,
+        # Where the play time went; walking to an activity counts towards it, idle exploring towards none
+        'share_of_hours': {name: round(h / hours, 3) for name, h in activity_hours.items()}
+    }
+    if reached:
+        summary['hours_to_tier_5'] = {
+            'mean': round(statistics.mean(reached), 2),
+            'p50': round(percentile(reached, 0.5), 2),
+            'p90': round(percentile(reached, 0.9), 2)
+        }
+    summary['warnings'] = sanity_warnings(summary)
+    return summary
+
+def sanity_warnings(summary):
+    """Figures outside SANITY_RANGES"""
+    figures = {'coins_per_hour': summary['coins_per_hour']}
+    if 'hours_to_tier_5' in summary:
+        figures['hours_to_tier_5_p50'] = summary['hours_to_tier_5']['p50']
+    warnings = []
+    for name, value in figures.items():
+        low, high = SANITY_RANGES[name]
+        if not low <= value <= high:
+            warnings.append(f"{name} = {value} is outside the expected {low}-{high}; "
+                            "check PLAY_SECONDS and share_of_hours before tuning from it")
+    return warnings
+
+def main():
+    parser = argparse.ArgumentParser(description="Simulate many play sessions without a display")
+    parser.add_argument('--runs', type=int, default=100)
+    parser.add_argument('--agent', choices=sorted(AGENTS), default='scripted')
+    parser.add_argument('--max-hours', type=float, default=10, help="play time limit per run")
+    parser.add_argument('--workers', type=int, default=None, help="processes (default: all cores)")
+    parser.add_argument('--seed', type=int, default=0, help="seed of the first run")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    results = run_simulations(args.runs, args.agent, args.max_hours, args.workers, args.seed)
+    summary = summarize(results)
+    summary['wall_seconds'] = round(time.perf_counter() - start, 1)
+    print(json.dumps(summary, indent=2))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+"""
+Process-wide sprite cache.
+
+Images are decoded and resized once per (file, size) and handed out as
+shared PhotoImages, so windows that open again and again (like the hunting
+ground) don't touch the disk after the first time:
+
+    image = sprites.get_photo(self, "Deer_Left.png", (50, 50))
+
+Asset files are looked up next to the game, in attached_assets/ and in the
+directory named by ODYSSEY_ASSETS. Sprites can also come from a pre-built
+atlas, one PNG holding every sprite at its display size plus a JSON index,
+made with:
+
+    python sprites.py --build-atlas
+"""
+import argparse
+import json
+import os
+
+from PIL import Image, ImageTk
+
+GAME_DIR = os.path.dirname(os.path.abspath(__file__))
+ATLAS_IMAGE = os.path.join(GAME_DIR, "sprite_atlas.png")
+ATLAS_INDEX = os.path.join(GAME_DIR, "sprite_atlas.json")
+FALLBACK_COLOR = (255, 0, 0)
+
+# Sprites used by the game at their display sizes, for the atlas
+SPRITE_SIZES = {
+    **{f"Chicken_{pose}.png": (25, 25) for pose in ("Left", "Right", "Dead")},
+    **{f"Deer_{pose}.png": (50, 50) for pose in ("Left", "Right", "Dead")},
+    **{f"Bear_{pose}.png": (50, 50) for pose in ("Left", "Right", "Dead")},
+    **{f"Bird_{pose}.png": (35, 35) for pose in ("Left", "Right", "Dead")},
+}
+
+# (name, size) -> PIL image, shared by every Tk interpreter
+_images = {}
+# (Tk interpreter, name, size) -> PhotoImage
+_photos = {}
+_atlas = None  # (atlas image, {key: box}) once loaded, False if there is none
+
+
+def asset_dirs():
+    dirs = []
+    if os.environ.get("ODYSSEY_ASSETS"):
+        dirs.append(os.environ["ODYSSEY_ASSETS"])
+    for base in (GAME_DIR, os.getcwd()):
+        dirs.extend([base, os.path.join(base, "attached_assets")])
+    return dirs
+
+def find_asset(name):
+    """Path of the asset file called name, or None if it can't be found"""
+    for directory in asset_dirs():
+        path = os.path.join(directory, name)
+        if os.path.isfile(path):
+            return path
+    return None
+
+def atlas_key(name, size):
+    return f"{name}@{size[0]}x{size[1]}"
+
+def load_atlas():
+    global _atlas
+    if _atlas is None:
+        _atlas = False
+        if os.path.isfile(ATLAS_IMAGE) and os.path.isfile(ATLAS_INDEX):
+            try:
+                with open(ATLAS_INDEX, 'r') as f:
+                    index = json.load(f)
+                image = Image.open(ATLAS_IMAGE)
+                image.load()
+                _atlas = (image, index)
+            except Exception as e:
+                print(f"Error loading sprite atlas: {str(e)}")
+    return _atlas
+
+def get_image(name, size):
+    """PIL image of the named asset at size, decoded once; a red square if it is missing"""
+    size = tuple(size)
+    key = (name, size)
+    image = _images.get(key)
+    if image is not None:
+        return image
+
+    atlas = load_atlas()
+    box = atlas[1].get(atlas_key(name, size)) if atlas else None
+    if box:
+        image = atlas[0].crop(tuple(box))
+    else:
+        path = find_asset(name)
+        try:
+            if path is None:
+                raise FileNotFoundError(f"{name} not found in {', '.join(asset_dirs())}")
+            with Image.open(path) as source:
+                image = source.convert('RGBA').resize(size)
+        except Exception as e:
+            print(f"Error loading image {name}: {str(e)}")
+            image = Image.new('RGB', size, color=FALLBACK_COLOR)
+    _images[key] = image
+    return image
+
+def get_photo(widget, name, size):
+    """Shared PhotoImage of the named asset for widget's Tk interpreter"""
+    key = (widget.tk, name, tuple(size))
+    photo = _photos.get(key)
+    if photo is None:
+        photo = ImageTk.PhotoImage(get_image(name, size), master=widget)
+        _photos[key] = photo
+    return photo
+
+def build_atlas(sprites=SPRITE_SIZES, image_path=ATLAS_IMAGE, index_path=ATLAS_INDEX):
+    """Pack sprites ({name: size}) into one row and write the atlas image and index"""
+    global _atlas
+    images = {atlas_key(name, size): get_image(name, size) for name, size in sprites.items()}
+    width = sum(image.width for image in images.values())
+    height = max(image.height for image in images.values())
+    atlas = Image.new('RGBA', (width, height))
+    index = {}
+    x = 0
+    for key, image in images.items():
+        atlas.paste(image, (x, 0))
+        index[key] = [x, 0, x + image.width, image.height]
+        x += image.width
+    atlas.save(image_path)
+    with open(index_path, 'w') as f:
+        json.dump(index, f, indent=4)
+    _atlas = None  # Pick up the new atlas
+    print(f"Sprite atlas with {len(index)} sprites written to {image_path}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Sprite tools")
+    parser.add_argument('--build-atlas', action='store_true', help="pack the game's sprites into one image")
+    args = parser.parse_args()
+    if args.build_atlas:
+        build_atlas()
+    else:
+        parser.print_help()
@@ -0,0 +1,156 @@
+"""
+Checks of the game rules that run without a display: saves, the point of
+interest index, dice distributions and hunt replays.
+
+    python -m pytest -q
+"""
+import json
+import random
+
+import pytest
+
+import hunt_replay
+from dice import get_distribution, kill_chance
+from game_logic import WorldMap, GameState, PointIndex, Weapon, CHUNK_SIZE, generate_terrain
+from minigame_engines import HuntingEngine
+
+SEED = 1234
+
+
+def played_world():
+    """A small explored world with something of every kind a save has to keep"""
+    world = WorldMap(seed=SEED)
+    world.generate_region(0, 0, 2 * CHUNK_SIZE, 2 * CHUNK_SIZE)
+    world.set_terrain(3, 4, 'M')
+    world.forest_wood[(5, 5)] = 7
+    world.mark_house_looted(10, 10, 2, 3)
+    world.store_town_layout(10, 10, ([['.', 'H'], ['H', '.']], {(1, 0): True, (0, 1): False}))
+    world.town_names[(10, 10)] = "Little Brook"
+    world.npc_names[(10, 10, 'chef')] = "Anne Panson"
+    fort = world.get_fort_inventory(20, 20)
+    fort.append(Weapon(tier=3, rng=random.Random(SEED)))
+    world.mark_fort_modified(20, 20)
+    return world
+
+def save_and_load(data):
+    """Through JSON, like a save file"""
+    return WorldMap.from_dict(json.loads(json.dumps(data)))
+
+def test_delta_save_round_trip():
+    world = played_world()
+    saved = world.to_dict()
+    loaded = save_and_load(saved)
+    assert loaded.to_dict() == json.loads(json.dumps(saved))
+    assert loaded.get_terrain(3, 4) == 'M'
+    assert loaded.forest_wood[(5, 5)] == 7
+    assert loaded.is_house_looted(10, 10, 2, 3)
+    assert loaded.get_town_layout(10, 10) == world.get_town_layout(10, 10)
+    assert saved['fort_inventories'] and loaded.modified_forts == {(20, 20)}
+    # Untouched tiles regenerate from the seed
+    assert loaded.get_terrain(40, 40) == generate_terrain(SEED, 40, 40)[0]
+
+def test_legacy_save_loads_and_saves_again():
+    source = WorldMap(seed=SEED)
+    source.generate_region(0, 0, CHUNK_SIZE, CHUNK_SIZE)
+    legacy = {
+        'seed': SEED,
+        'map': {},
+        'town_types': {},
+        'mineshafts': [],
+        'looted_houses': [[10, 10, 2, 3]],
+        'town_layouts': {'10,10': {'map': ['.H', 'H.'], 'lights': [[1, 0, True]]}},
+        'town_names': {'10,10': "Little Brook"},
+        'npc_names': {'10,10,chef': "Anne Panson"},
+        'forest_wood': {'5,5': 7},
+        'fort_inventories': {}
+    }
+    for x, y, tile in source.map.items():
+        legacy['map'].setdefault(str(y), {})[str(x)] = tile
+    legacy['map']['4']['3'] = 'M' if source.get_terrain(3, 4) != 'M' else 'P'
+    changed = legacy['map']['4']['3']
+
+    world = save_and_load(legacy)
+    assert world.get_terrain(3, 4) == changed
+    assert world.town_names == {(10, 10): "Little Brook"}
+    assert world.npc_names == {(10, 10, 'chef'): "Anne Panson"}
+    assert world.get_town_layout(10, 10) == ([['.', 'H'], ['H', '.']], {(1, 0): True})
+
+    again = save_and_load(world.to_dict())
+    assert again.get_terrain(3, 4) == changed
+    assert again.town_names == world.town_names
+    assert again.get_town_layout(10, 10) == world.get_town_layout(10, 10)
+    assert again.forest_wood[(5, 5)] == 7
+
+def test_point_index_nearest_matches_brute_force():
+    rng = random.Random(SEED)
+    index = PointIndex(bucket_size=16)
+    points = set()
+    for _ in range(300):
+        point = (rng.randint(-500, 500), rng.randint(-500, 500))
+        points.add(point)
+        index.add('town', *point)
+    for point in rng.sample(sorted(points), 50):
+        points.discard(point)
+        index.remove('town', *point)
+
+    def distance(point, x, y):
+        return (point[0] - x) ** 2 + (point[1] - y) ** 2
+
+    for _ in range(200):
+        x, y = rng.randint(-700, 700), rng.randint(-700, 700)
+        expected = min(distance(point, x, y) for point in points)
+        found = index.nearest('town', x, y)
+        assert distance(found, x, y) == expected
+        limited = index.nearest('town', x, y, max_radius=40)
+        if expected <= 40 * 40:
+            assert distance(limited, x, y) == expected
+        else:
+            assert limited is None
+    assert index.nearest('fort', 0, 0) is None
+
+@pytest.mark.parametrize('dice_config', [(1, 6, 2), (2, 6, 2), (3, 8, 4), (6, 12, 10), (10, 6, 15)])
+def test_dice_distribution_sums_to_one(dice_config):
+    distribution = get_distribution(dice_config)
+    assert sum(distribution.ways) == distribution.outcomes
+    assert sum(distribution.probabilities) == pytest.approx(1.0)
+    mean = sum((distribution.minimum + i) * p for i, p in enumerate(distribution.probabilities))
+    assert mean == pytest.approx(distribution.mean)
+    rng = random.Random(SEED)
+    rolls = [distribution.sample(rng) for _ in range(2000)]
+    assert distribution.minimum <= min(rolls) and max(rolls) <= distribution.maximum
+
+def test_kill_chance_bounds():
+    assert kill_chance((1, 6, 2), hp=3, hits=1) == pytest.approx(1.0)
+    assert kill_chance((1, 6, 2), hp=100, hits=1) == pytest.approx(0.0, abs=1e-12)
+    assert kill_chance((2, 6, 2), hp=30, hits=2) < kill_chance((2, 6, 2), hp=30, hits=3)
+
+def record_hunt(seed):
+    game = GameState(seed=SEED)
+    game.inventory = {'bullets': 60}
+    recorder = hunt_replay.HuntRecorder(seed, game)
+    engine = HuntingEngine(game, rng=random.Random(seed))
+    aim = random.Random(seed)
+    while not engine.finished:
+        if engine.steps % 20 == 0 and engine.animals:
+            target = aim.choice(engine.animals)
+            action = ('shoot', target.x + aim.uniform(-5, 5), target.y + aim.uniform(-5, 5))
+            recorder.record(engine, action)
+            engine.step(action)
+        engine.update()
+    return recorder.to_bytes(engine), engine
+
+def test_hunt_replay_is_deterministic():
+    data, engine = record_hunt(SEED)
+    recording = hunt_replay.Recording(data)
+    assert recording.events
+    first = hunt_replay.replay(recording)
+    second = hunt_replay.replay(recording)
+    assert first.score == second.score == engine.score
+    assert hunt_replay.state_digest(first) == hunt_replay.state_digest(second) == recording.digest
+
+def test_hunt_replay_detects_a_different_outcome():
+    data, _ = record_hunt(SEED)
+    recording = hunt_replay.Recording(data)
+    recording.seed += 1
+    with pytest.raises(hunt_replay.ReplayMismatch):
+        hunt_replay.replay(recording)